@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark the odds, grading and leaderboard paths on synthetic leagues.
+
+Each scenario runs the real functions from scripts/ on a League from
+synthetic.py and reports the median wall time over several repeats. Results
+are compared with benchmarks/baselines.json; a scenario slower than its
+baseline by more than --tolerance is reported as a regression (exit code 1).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+import statistics
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from synthetic import League
+from script import split_markets, build_frame
+from results_script import calculate_ats_results, evaluate_picks
+from grading import grade_ats, grade_locked_picks
+from supabase_integration import aggregate_leaderboard
+from leaderboard_snapshot import build_snapshot
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Named league sizes; any field can be overridden from the command line
+PROFILES = {
+    "friends": dict(seasons=1, games_per_week=16, users=6, picks_per_week=5, books=5),
+    "club": dict(seasons=1, games_per_week=16, users=200, picks_per_week=8, books=8),
+    "site": dict(seasons=3, games_per_week=16, users=2000, picks_per_week=10, books=12),
+}
+
+def scenarios(league, workdir):
+    """{name: zero-argument callable} for one league.
+
+    Per-week scenarios use week 1 (what a Sunday-night run does); the
+    season scenarios cover every week at once.
+    """
+    week = 1
+    events = split_markets(league.odds_events(week))
+    odds_csv = os.path.join(workdir, "lines.csv")
+    picks_csv = os.path.join(workdir, "picks.csv")
+    league.week_lines(week).to_csv(odds_csv, index=False)
+    league.week_picks(week)[["user", "team"]].to_csv(picks_csv, index=False)
+    results = league.week_results(week)
+    ats = calculate_ats_results(results, odds_csv)
+    season_ats = grade_ats(league.results, league.lines, keys=("week", "home", "away"))
+
+    return {
+        "build_frame": lambda: build_frame(events["spreads"], events["totals"], events["h2h"]),
+        "build_frame_all_books": lambda: build_frame(events["spreads"], events["totals"], events["h2h"],
+                                                     all_books=True),
+        "calculate_ats_results": lambda: calculate_ats_results(results, odds_csv),
+        "evaluate_picks": lambda: evaluate_picks(ats, picks_csv),
+        "grade_season": lambda: grade_ats(league.results, league.lines, keys=("week", "home", "away")),
+        "grade_season_locked": lambda: grade_locked_picks(season_ats, league.picks, keys=["week"]),
+        "leaderboard": lambda: aggregate_leaderboard(league.picks),
+        "leaderboard_snapshot": lambda: build_snapshot(league.picks),
+    }
+
+def time_call(fn, repeat):
+    """Median and min seconds over `repeat` runs (after one warm-up call)."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fn()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    return statistics.median(times), min(times)
+
+def load_baselines(path=BASELINES):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def main():
+    ap = argparse.ArgumentParser(description="Time the grading/leaderboard paths on synthetic leagues.")
+    ap.add_argument("--profile", choices=PROFILES, action="append",
+                    help="League size to run (repeatable; default: all)")
+    ap.add_argument("--only", action="append", help="Run only this scenario (repeatable)")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario (default 5)")
+    ap.add_argument("--seasons", type=int, help="Override seasons for every profile")
+    ap.add_argument("--games-per-week", type=int, help="Override games per week")
+    ap.add_argument("--users", type=int, help="Override number of users")
+    ap.add_argument("--picks-per-week", type=int, help="Override picks per user per week")
+    ap.add_argument("--books", type=int, help="Override bookmakers per game")
+    ap.add_argument("--seed", type=int, default=2025)
+    ap.add_argument("--tolerance", type=float, default=1.5,
+                    help="Flag scenarios slower than baseline by more than this factor (default 1.5)")
+    ap.add_argument("--save-baseline", action="store_true", help="Store these timings as the new baselines")
+    args = ap.parse_args()
+
+    overrides = {k: getattr(args, k) for k in ("seasons", "games_per_week", "users", "picks_per_week", "books")
+                 if getattr(args, k) is not None}
+    baselines = load_baselines()
+    regressions = []
+
+    for profile in args.profile or list(PROFILES):
+        config = {**PROFILES[profile], **overrides}
+        league = League(seed=args.seed, **config)
+        print(f"\n{profile}: " + ", ".join(f"{k}={v}" for k, v in config.items())
+              + f" ({len(league.lines)} games, {len(league.picks)} picks)")
+        # Overridden sizes are not comparable with the stored baselines
+        key = profile if not overrides else None
+        with tempfile.TemporaryDirectory() as workdir:
+            for name, fn in scenarios(league, workdir).items():
+                if args.only and name not in args.only:
+                    continue
+                median, best = time_call(fn, args.repeat)
+                line = f"  {name:<24} {median * 1000:9.2f} ms  (min {best * 1000:.2f})"
+                base = baselines.get(key, {}).get(name) if key else None
+                if base:
+                    ratio = median / base
+                    line += f"  {ratio:5.2f}x baseline"
+                    if ratio > args.tolerance:
+                        line += "  REGRESSION"
+                        regressions.append(f"{profile}/{name}")
+                print(line)
+                if args.save_baseline and key:
+                    baselines.setdefault(key, {})[name] = round(median, 6)
+
+    if args.save_baseline:
+        if overrides:
+            print("\nNot saving baselines: league size was overridden")
+        else:
+            with open(BASELINES, "w") as f:
+                json.dump(baselines, f, indent=2, sort_keys=True)
+                f.write("\n")
+            print(f"\nBaselines saved to {BASELINES}")
+    if regressions:
+        sys.exit(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# synthetic.py
+"""Synthetic league generator for the benchmarks.
+
+Frames follow the real schemas in data/lines and data/results (and the
+picks table), so the benchmarked code runs unmodified at any league size.
+"""
+import os, glob
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+BOOKS = ["DraftKings", "FanDuel", "BetMGM", "Caesars", "BetRivers", "Bovada",
+         "PointsBet", "Unibet", "WynnBET", "SuperBook", "BetOnline", "LowVig"]
+WEEKS_PER_SEASON = 18
+SEASON_START = pd.Timestamp("2025-09-07 13:00", tz="America/New_York")
+
+def real_teams():
+    """Team names seen in the committed lines CSVs."""
+    teams = set()
+    for path in glob.glob(os.path.join(REPO_DIR, "data", "lines", "nfl_lines_week*.csv")):
+        df = pd.read_csv(path, usecols=["away", "home"])
+        teams.update(df["away"])
+        teams.update(df["home"])
+    return sorted(teams)
+
+def half_points(values):
+    return np.round(np.asarray(values) * 2) / 2
+
+class League:
+    """All frames for one synthetic league.
+
+    `week` numbers run across seasons (season 2 week 1 is week 19) so a
+    whole league can be graded in one keyed pass.
+    """
+
+    def __init__(self, seasons=1, games_per_week=16, users=6, picks_per_week=5, books=5, seed=2025):
+        self.rng = np.random.default_rng(seed)
+        teams = real_teams()
+        teams += [f"Team {i}" for i in range(len(teams), 2 * games_per_week)]
+        self.teams = np.array(teams)
+        self.books = [BOOKS[i] if i < len(BOOKS) else f"Book {i + 1}" for i in range(books)]
+        self.weeks = seasons * WEEKS_PER_SEASON
+        self.games_per_week = games_per_week
+        self.lines, self.results = self._games()
+        self.picks = self._picks(users, picks_per_week)
+
+    def _games(self):
+        rng, g = self.rng, self.games_per_week
+        n = self.weeks * g
+        week = np.repeat(np.arange(1, self.weeks + 1), g)
+        order = np.argsort(rng.random((self.weeks, len(self.teams))), axis=1)[:, :2 * g]
+        away = self.teams[order[:, 0::2]].ravel()
+        home = self.teams[order[:, 1::2]].ravel()
+        days = (week - 1) * 7 + (week - 1) // WEEKS_PER_SEASON * 364
+        kickoff = SEASON_START + pd.to_timedelta(days, unit="D") + pd.to_timedelta(rng.integers(0, 3, n) * 3, unit="h")
+
+        spread_home = half_points(rng.normal(-1.5, 6, n))
+        total = half_points(rng.normal(45, 4, n))
+        lines = pd.DataFrame({
+            "week": week,
+            "kickoff_et": kickoff,
+            "away": away,
+            "home": home,
+            "spread_away": -spread_home,
+            "spread_away_price": rng.choice([-115, -110, -105], n),
+            "spread_home": spread_home,
+            "spread_home_price": rng.choice([-115, -110, -105], n),
+            "total": total,
+            "over_price": rng.choice([-112, -110, -108], n),
+            "under_price": rng.choice([-112, -110, -108], n),
+            "ml_away": np.where(spread_home < 0, 150, -170),
+            "ml_home": np.where(spread_home < 0, -170, 150),
+            "spreads_book": self.books[0],
+            "totals_book": self.books[0],
+            "h2h_book": self.books[0],
+        })
+        results = lines[["week", "kickoff_et", "away", "home"]].copy()
+        results["away_score"] = rng.poisson(21, n)
+        results["home_score"] = rng.poisson(23, n)
+        return lines, results
+
+    def _picks(self, users, per_week):
+        rng = self.rng
+        per_week = min(per_week, self.games_per_week)
+        rows = users * self.weeks * per_week
+        user = np.repeat([f"user{i}" for i in range(users)], self.weeks * per_week)
+        week = np.tile(np.repeat(np.arange(1, self.weeks + 1), per_week), users)
+        # Distinct games per user and week, then a random side of each
+        slot = np.argsort(rng.random((users * self.weeks, self.games_per_week)), axis=1)[:, :per_week].ravel()
+        game = (week - 1) * self.games_per_week + slot
+        home_side = rng.random(rows) < 0.5
+        lines = self.lines
+        team = np.where(home_side, lines["home"].to_numpy()[game], lines["away"].to_numpy()[game])
+        spread = np.where(home_side, lines["spread_home"].to_numpy()[game], lines["spread_away"].to_numpy()[game])
+        correct = rng.choice(np.array([True, False, None], dtype=object), rows, p=[0.48, 0.48, 0.04])
+        return pd.DataFrame({"user": user, "user_id": user, "week": week, "game_id": slot + 1,
+                             "team": team, "spread": spread, "correct": correct})
+
+    def week_lines(self, week):
+        return self.lines[self.lines["week"] == week].drop(columns="week").reset_index(drop=True)
+
+    def week_results(self, week):
+        return self.results[self.results["week"] == week].drop(columns="week").reset_index(drop=True)
+
+    def week_picks(self, week):
+        return self.picks[self.picks["week"] == week].reset_index(drop=True)
+
+    def odds_events(self, week):
+        """One combined-markets Odds API response for `week`, with every book quoting."""
+        rng = self.rng
+        events = []
+        for i, game in enumerate(self.week_lines(week).itertuples(index=False)):
+            books = []
+            for title in self.books:
+                spread = game.spread_home + rng.choice([-0.5, 0, 0, 0.5])
+                total = game.total + rng.choice([-0.5, 0, 0, 0.5])
+                books.append({"key": title.lower(), "title": title, "markets": [
+                    {"key": "spreads", "outcomes": [
+                        {"name": game.home, "point": spread, "price": int(rng.choice([-115, -110, -105]))},
+                        {"name": game.away, "point": -spread, "price": int(rng.choice([-115, -110, -105]))}]},
+                    {"key": "totals", "outcomes": [
+                        {"name": "Over", "point": total, "price": int(rng.choice([-112, -110, -108]))},
+                        {"name": "Under", "point": total, "price": int(rng.choice([-112, -110, -108]))}]},
+                    {"key": "h2h", "outcomes": [
+                        {"name": game.home, "price": int(game.ml_home)},
+                        {"name": game.away, "price": int(game.ml_away)}]},
+                ]})
+            events.append({"id": f"w{week}g{i}", "commence_time": game.kickoff_et.tz_convert("UTC").isoformat(),
+                           "home_team": game.home, "away_team": game.away, "bookmakers": books})
+        return events
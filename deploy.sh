@@ -7,6 +7,10 @@ echo "🏈 Deploying NFL Spread League to GitHub Pages..."
 echo "📊 Copying latest odds data..."
 cp nfl_lines_week.csv nfl-pickem/public/
 
+# Compile the public CSVs into the season bundle the app loads
+echo "📦 Building season bundle..."
+python3 scripts/build_bundle.py
+
 # Navigate to React app directory
 cd nfl-pickem
 
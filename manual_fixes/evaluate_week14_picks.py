@@ -6,7 +6,8 @@ import os
 
 # Add the scripts directory to the path to import supabase_integration
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
-from supabase_integration import update_pick_results, get_leaderboard
+from grading import grade_picks
+from supabase_integration import update_pick_results, get_leaderboard, require_explicit_project
 
 def evaluate_picks_from_results():
     """Evaluate picks using existing results CSV file"""
@@ -18,45 +19,14 @@ def evaluate_picks_from_results():
     print(f"Found {len(results_df)} completed games in results file")
     print(f"Found {len(picks_df)} picks to evaluate")
     
-    user_results = []
+    results_df_final = grade_picks(results_df, picks_df)
+    for _, pick in results_df_final.iterrows():
+        print(f"{pick['user']} picked {pick['team']}: {pick['result']}")
     
-    for _, pick in picks_df.iterrows():
-        user = pick["user"]
-        team = pick["team"]
-        
-        # Find the game result for this team
-        team_games = results_df[
-            (results_df["home"] == team) | (results_df["away"] == team)
-        ]
-        
-        if team_games.empty:
-            print(f"Warning: No result found for {user}'s pick: {team}")
-            continue
-        
-        game = team_games.iloc[0]
-        
-        # Determine if this team covered the spread
-        if game["home"] == team:
-            ats_result = game["home_ats_result"]
-        else:
-            ats_result = game["away_ats_result"]
-        
-        user_results.append({
-            "user": user,
-            "team": team,
-            "opponent": game["away"] if game["home"] == team else game["home"],
-            "result": ats_result,
-            "game_date": pd.to_datetime(game["kickoff_et"]).strftime("%Y-%m-%d")
-        })
-        
-        print(f"{user} picked {team}: {ats_result}")
-    
-    if not user_results:
+    if results_df_final.empty:
         print("No pick results to process")
         return
     
-    results_df_final = pd.DataFrame(user_results)
-    
     # Show results summary
     print("\n=== PICK RESULTS ===")
     for user in results_df_final["user"].unique():
@@ -88,4 +58,5 @@ def evaluate_picks_from_results():
         print("✗ Failed to update Supabase")
 
 if __name__ == "__main__":
+    require_explicit_project()
     evaluate_picks_from_results()
\ No newline at end of file
@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-from supabase_integration import get_supabase_client
+import os
+import sys
+
+# Add the scripts directory to the path to import supabase_integration
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from supabase_integration import get_supabase_client, require_explicit_project
 
 def fix_lions_picks():
     """Fix Lions picks for Week 5 - they should be marked as WIN (covered -10.5)."""
@@ -32,4 +37,5 @@ def fix_lions_picks():
         print(f"Error updating Lions picks: {e}")
 
 if __name__ == "__main__":
+    require_explicit_project()
     fix_lions_picks()
\ No newline at end of file
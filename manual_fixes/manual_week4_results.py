@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
 
 import pandas as pd
-from supabase_integration import update_pick_results
+import os
+import sys
+
+# Add the scripts directory to the path to import supabase_integration
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from supabase_integration import update_pick_results, require_explicit_project
+
+require_explicit_project()
 
 # Load the picks and results
 picks_df = pd.read_csv("picks_week4.csv")
@@ -2,7 +2,10 @@
 import pandas as pd
 import sys
 import os
-from supabase_integration import get_supabase_client, extract_picks_for_week
+
+# Add the scripts directory to the path to import supabase_integration
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from supabase_integration import get_supabase_client, extract_picks_for_week, require_explicit_project
 
 def process_manual_results():
     """Process manual Week 5 results and update Supabase."""
@@ -71,4 +74,5 @@ def process_manual_results():
     print(f"\nProcessing complete. Made {updates_made} updates to Supabase.")
 
 if __name__ == "__main__":
+    require_explicit_project()
     process_manual_results()
\ No newline at end of file
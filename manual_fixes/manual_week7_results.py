@@ -5,7 +5,13 @@ Processes the manually provided game results and calculates ATS outcomes.
 """
 
 import pandas as pd
-from supabase_integration import extract_picks_for_week, update_pick_results, get_leaderboard
+import os
+import sys
+
+# Add the scripts directory to the path to import supabase_integration
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from supabase_integration import (extract_picks_for_week, update_pick_results, get_leaderboard,
+                                  require_explicit_project)
 
 # Manual game results data
 manual_results = [
@@ -255,4 +261,5 @@ def main():
     print(f"\nResults saved to manual_week7_ats_results.csv and manual_week7_pick_results.csv")
 
 if __name__ == "__main__":
+    require_explicit_project()
     main()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
-import Papa from 'papaparse';
 import { supabase } from './supabase';
 import * as yaml from 'js-yaml';
+import { loadSeasonBundle, loadCsvRows } from './seasonBundle';
 
 interface Game {
   id: string;
@@ -38,6 +38,63 @@ interface Pick {
   correct: number;
 }
 
+interface LiveGame {
+  game_id: string;
+  kickoff_et: string;
+  away: string;
+  home: string;
+  away_score: number | null;
+  home_score: number | null;
+  completed: boolean;
+}
+
+interface LivePick {
+  user: string;
+  team: string;
+  opponent: string;
+  spread: number;
+  margin: number;
+  completed: boolean;
+  status: string; // covering / push / not covering while live, W / P / L once final
+}
+
+interface LiveSnapshot {
+  week: number;
+  games: LiveGame[];
+  picks: LivePick[];
+  generatedAt: string;
+}
+
+interface LeaderboardStanding {
+  rank: number;
+  rank_change: number | null; // positive = moved up since the previous graded week
+  user: string;
+  wins: number;
+  losses: number;
+  pushes: number;
+  pending: number;
+  graded_picks: number;
+  percentage: number;
+}
+
+interface WeekRecord {
+  user: string;
+  wins: number;
+  losses: number;
+  pushes: number;
+  pending: number;
+}
+
+interface LeaderboardSnapshot {
+  version: number;
+  through_week: number | null;
+  standings: LeaderboardStanding[]; // regular season, ranked by wins over graded weeks
+  weeks: {[week: string]: WeekRecord[]};
+}
+
+// scripts/score_poller.py --live republishes the snapshot every few minutes during games
+const LIVE_POLL_MS = 60 * 1000;
+
 interface User {
   id: string;
   name: string;
@@ -70,44 +127,69 @@ function App() {
   const [playoffWeek, setPlayoffWeek] = useState(102); // 100 = Wild Card, 101 = Divisional, 102 = Conference, 103 = Super Bowl
   const [teamAbbreviations, setTeamAbbreviations] = useState<{[key: string]: string}>({});
   const [weatherData, setWeatherData] = useState<WeatherData[]>([]);
+  const [liveSnapshot, setLiveSnapshot] = useState<LiveSnapshot | null>(null);
+  const [leaderboardSnapshot, setLeaderboardSnapshot] = useState<LeaderboardSnapshot | null>(null);
+  const liveWeek = mode === 'playoffs' ? playoffWeek : currentWeek;
+  // The regular-season Leaderboard reads only the snapshot; every other view needs the picks table
+  const needsPicks = mode === 'playoffs' || activeTab !== 'leaderboard';
+  const [picksRequested, setPicksRequested] = useState(false);
 
   useEffect(() => {
     // Load games from CSV (we'll create this from your odds script)
     loadGames();
     loadPlayoffGames(playoffWeek);
-    loadPicks();
     loadTeamAbbreviations();
     loadWeatherData();
+    loadLeaderboardSnapshot();
   }, []);
 
+  useEffect(() => {
+    if (needsPicks && !picksRequested) {
+      setPicksRequested(true);
+      loadPicks();
+    }
+  }, [needsPicks, picksRequested]);
+
+  useEffect(() => {
+    // Poll the live scores / cover status row for the week on screen
+    let cancelled = false;
+    const loadLiveSnapshot = async () => {
+      const { data, error } = await supabase
+        .from('snapshots')
+        .select('data, generated_at')
+        .eq('name', `live_week${liveWeek}`)
+        .maybeSingle();
+      if (cancelled) return;
+      if (error) {
+        console.error('Error loading live snapshot:', error);
+        return;
+      }
+      setLiveSnapshot(data ? { ...data.data, generatedAt: data.generated_at } : null);
+    };
+    loadLiveSnapshot();
+    const timer = setInterval(loadLiveSnapshot, LIVE_POLL_MS);
+    return () => {
+      cancelled = true;
+      clearInterval(timer);
+    };
+  }, [liveWeek]);
+
   const loadGames = async () => {
     try {
-      // Load games from CSV file generated by the odds script
-      const response = await fetch(`${process.env.PUBLIC_URL}/lines/nfl_lines_week18.csv`);
-      const csvText = await response.text();
+      // Load games from the lines CSV generated by the odds script (via the season bundle)
+      const rows = await loadCsvRows('lines/nfl_lines_week18.csv');
+      const csvGames: Game[] = rows.map((row: any, index: number) => ({
+        id: `${index + 1}`,
+        kickoff_et: row.kickoff_et,
+        away: row.away,
+        home: row.home,
+        spread_away: parseFloat(row.spread_away),
+        spread_home: parseFloat(row.spread_home),
+        total: parseFloat(row.total),
+        spreads_book: row.spreads_book
+      })).filter(game => game.away && game.home); // Filter out empty rows
       
-      Papa.parse(csvText, {
-        header: true,
-        complete: (results) => {
-          const csvGames: Game[] = results.data.map((row: any, index: number) => ({
-            id: `${index + 1}`,
-            kickoff_et: row.kickoff_et,
-            away: row.away,
-            home: row.home,
-            spread_away: parseFloat(row.spread_away),
-            spread_home: parseFloat(row.spread_home),
-            total: parseFloat(row.total),
-            spreads_book: row.spreads_book
-          })).filter(game => game.away && game.home); // Filter out empty rows
-          
-          setGames(csvGames);
-        },
-        error: (error: any) => {
-          console.error('Error parsing CSV:', error);
-          // Fallback to sample data if CSV fails to load
-          loadSampleGames();
-        }
-      });
+      setGames(csvGames);
     } catch (error) {
       console.error('Error loading CSV file:', error);
       // Fallback to sample data if CSV fails to load
@@ -131,30 +213,19 @@ function App() {
         103: 'nfl_playoff_superbowl.csv'
       };
       const filename = playoffFiles[week] || 'nfl_playoff_conference.csv';
-      const response = await fetch(`${process.env.PUBLIC_URL}/lines/${filename}`);
-      const csvText = await response.text();
-
-      Papa.parse(csvText, {
-        header: true,
-        complete: (results) => {
-          const csvGames: Game[] = results.data.map((row: any, index: number) => ({
-            id: `playoff-${index + 1}`,
-            kickoff_et: row.kickoff_et,
-            away: row.away,
-            home: row.home,
-            spread_away: parseFloat(row.spread_away),
-            spread_home: parseFloat(row.spread_home),
-            total: parseFloat(row.total),
-            spreads_book: row.spreads_book
-          })).filter(game => game.away && game.home);
-
-          setPlayoffGames(csvGames);
-        },
-        error: (error: any) => {
-          console.error('Error parsing playoff CSV:', error);
-          setPlayoffGames([]);
-        }
-      });
+      const rows = await loadCsvRows(`lines/${filename}`);
+      const csvGames: Game[] = rows.map((row: any, index: number) => ({
+        id: `playoff-${index + 1}`,
+        kickoff_et: row.kickoff_et,
+        away: row.away,
+        home: row.home,
+        spread_away: parseFloat(row.spread_away),
+        spread_home: parseFloat(row.spread_home),
+        total: parseFloat(row.total),
+        spreads_book: row.spreads_book
+      })).filter(game => game.away && game.home);
+
+      setPlayoffGames(csvGames);
     } catch (error) {
       console.error('Error loading playoff CSV file:', error);
       setPlayoffGames([]);
@@ -163,6 +234,11 @@ function App() {
 
   const loadTeamAbbreviations = async () => {
     try {
+      const bundle = await loadSeasonBundle();
+      if (bundle) {
+        setTeamAbbreviations(bundle.teams);
+        return;
+      }
       const response = await fetch(`${process.env.PUBLIC_URL}/teamAbbreviations.yaml`);
       if (!response.ok) {
         console.error('Failed to load team abbreviations');
@@ -178,38 +254,38 @@ function App() {
 
   const loadWeatherData = async () => {
     try {
-      const response = await fetch(`${process.env.PUBLIC_URL}/weather_forecast.csv`);
-      if (!response.ok) {
-        console.error('Failed to load weather data');
-        return;
-      }
-      const csvText = await response.text();
+      const rows = await loadCsvRows('weather_forecast.csv');
+      const weatherRecords: WeatherData[] = rows
+        .filter((row: any) => row.team && row.weather_summary) // Filter out empty rows
+        .map((row: any) => ({
+          team: row.team,
+          stadium: row.stadium,
+          city: row.city,
+          state: row.state,
+          weather_summary: row.weather_summary,
+          forecast_time: row.forecast_time
+        }));
       
-      Papa.parse(csvText, {
-        header: true,
-        complete: (results) => {
-          const weatherRecords: WeatherData[] = results.data
-            .filter((row: any) => row.team && row.weather_summary) // Filter out empty rows
-            .map((row: any) => ({
-              team: row.team,
-              stadium: row.stadium,
-              city: row.city,
-              state: row.state,
-              weather_summary: row.weather_summary,
-              forecast_time: row.forecast_time
-            }));
-          
-          setWeatherData(weatherRecords);
-        },
-        error: (error: any) => {
-          console.error('Error parsing weather CSV:', error);
-        }
-      });
+      setWeatherData(weatherRecords);
     } catch (error) {
       console.error('Error loading weather data:', error);
     }
   };
 
+  const loadLeaderboardSnapshot = async () => {
+    // Standings published by scripts/leaderboard_snapshot.py whenever picks are graded
+    const { data, error } = await supabase
+      .from('snapshots')
+      .select('version, data')
+      .eq('name', 'leaderboard')
+      .maybeSingle();
+    if (error) {
+      console.error('Error loading leaderboard snapshot:', error);
+      return;
+    }
+    setLeaderboardSnapshot(data ? { ...data.data, version: data.version } : null);
+  };
+
   const loadPicks = async () => {
     try {
       const { data, error } = await supabase
@@ -351,6 +427,8 @@ function App() {
           </div>
         </div>
 
+        {liveSnapshot && <LiveStatus snapshot={liveSnapshot} users={users} selectedUser={selectedUser} />}
+
         {/* Regular Season Content */}
         {mode === 'regular' && (
           <>
@@ -437,7 +515,7 @@ function App() {
             <h2 className="text-2xl font-semibold text-gray-900 mb-4">
               Leaderboard
             </h2>
-            <Leaderboard users={users} picks={picks} currentWeek={currentWeek} />
+            <Leaderboard users={users} currentWeek={currentWeek} snapshot={leaderboardSnapshot} />
           </div>
         )}
 
@@ -587,6 +665,63 @@ interface PickInterfaceProps {
   weatherData: WeatherData[];
 }
 
+interface LiveStatusProps {
+  snapshot: LiveSnapshot;
+  users: User[];
+  selectedUser: string;
+}
+
+function LiveStatus({ snapshot, users, selectedUser }: LiveStatusProps) {
+  const liveGames = snapshot.games.filter(game => !game.completed);
+  if (liveGames.length === 0) return null;
+
+  const liveTeams = new Set(liveGames.flatMap(game => [game.home, game.away]));
+  const livePicks = snapshot.picks
+    .filter(pick => liveTeams.has(pick.team))
+    .sort((a, b) => (b.user === selectedUser ? 1 : 0) - (a.user === selectedUser ? 1 : 0));
+  const userName = (id: string) => users.find(u => u.id === id)?.name || id;
+  const statusClass = (status: string) =>
+    status === 'covering' ? 'bg-green-100 text-green-800' :
+    status === 'not covering' ? 'bg-red-100 text-red-800' :
+    'bg-gray-100 text-gray-600';
+
+  return (
+    <div className="mb-6 p-4 bg-white rounded-lg border border-red-200 shadow-sm">
+      <div className="flex items-center justify-between mb-3">
+        <h3 className="text-lg font-semibold text-gray-900">
+          <span className="text-red-500 mr-2">●</span>Live
+        </h3>
+        <span className="text-xs text-gray-500">
+          Updated {new Date(snapshot.generatedAt).toLocaleTimeString([], { hour: 'numeric', minute: '2-digit' })}
+        </span>
+      </div>
+      <div className="grid grid-cols-1 md:grid-cols-2 gap-2 mb-3">
+        {liveGames.map(game => (
+          <div key={game.game_id} className="text-sm text-gray-900 px-3 py-2 bg-gray-50 rounded">
+            {game.away} <span className="font-semibold">{game.away_score ?? '-'}</span>
+            {' @ '}
+            {game.home} <span className="font-semibold">{game.home_score ?? '-'}</span>
+          </div>
+        ))}
+      </div>
+      {livePicks.length > 0 && (
+        <div className="flex flex-wrap gap-2">
+          {livePicks.map(pick => (
+            <span
+              key={`${pick.user}-${pick.team}`}
+              className={`text-xs font-medium px-2 py-1 rounded ${statusClass(pick.status)} ${
+                pick.user === selectedUser ? 'ring-2 ring-blue-400' : ''
+              }`}
+            >
+              {userName(pick.user)}: {pick.team} {pick.spread > 0 ? '+' : ''}{pick.spread} ({pick.status})
+            </span>
+          ))}
+        </div>
+      )}
+    </div>
+  );
+}
+
 function PickInterface({ games, currentPicks, onSavePicks, selectedUser, users, weatherData }: PickInterfaceProps) {
   const [selectedPicks, setSelectedPicks] = useState<TeamPick[]>(currentPicks);
   const [hasExistingPicks, setHasExistingPicks] = useState<boolean>(currentPicks.length > 0);
@@ -966,8 +1101,8 @@ function PickInterface({ games, currentPicks, onSavePicks, selectedUser, users,
 
 interface LeaderboardProps {
   users: User[];
-  picks: Pick[];
   currentWeek: number;
+  snapshot: LeaderboardSnapshot | null;
 }
 
 interface PickChartProps {
@@ -1612,26 +1747,19 @@ function PlayoffPickChart({ picks, users, currentPlayoffWeek, teamAbbreviations
       if (!weekInfo) return;
 
       try {
-        const response = await fetch(`${process.env.PUBLIC_URL}/lines/${weekInfo.file}`);
-        const csvText = await response.text();
-
-        Papa.parse(csvText, {
-          header: true,
-          complete: (results) => {
-            const csvGames: Game[] = results.data.map((row: any, index: number) => ({
-              id: `playoff-${index + 1}`,
-              kickoff_et: row.kickoff_et,
-              away: row.away,
-              home: row.home,
-              spread_away: parseFloat(row.spread_away),
-              spread_home: parseFloat(row.spread_home),
-              total: parseFloat(row.total),
-              spreads_book: row.spreads_book
-            })).filter((game: Game) => game.away && game.home);
-
-            setGames(csvGames);
-          }
-        });
+        const rows = await loadCsvRows(`lines/${weekInfo.file}`);
+        const csvGames: Game[] = rows.map((row: any, index: number) => ({
+          id: `playoff-${index + 1}`,
+          kickoff_et: row.kickoff_et,
+          away: row.away,
+          home: row.home,
+          spread_away: parseFloat(row.spread_away),
+          spread_home: parseFloat(row.spread_home),
+          total: parseFloat(row.total),
+          spreads_book: row.spreads_book
+        })).filter((game: Game) => game.away && game.home);
+
+        setGames(csvGames);
       } catch (error) {
         console.error('Error loading playoff games:', error);
         setGames([]);
@@ -1850,73 +1978,41 @@ function PlayoffPickChart({ picks, users, currentPlayoffWeek, teamAbbreviations
   );
 }
 
-function Leaderboard({ users, picks, currentWeek }: LeaderboardProps) {
-  const getUserTotalCorrect = (userId: string) => {
-    // Only count completed weeks (exclude current pending week)
-    // Count only wins (correct === true), NOT pushes (correct === null)
-    return picks.filter(p => p.userId === userId && p.week < currentWeek).reduce((sum, pick) => {
-      return sum + pick.picks.filter(teamPick => teamPick.correct === true).length;
-    }, 0);
-  };
-
-  const getUserTotalPicks = (userId: string) => {
-    // Count all picks made (including pushes), but only from completed weeks
-    return picks.filter(p => p.userId === userId && p.week < currentWeek).reduce((sum, pick) => {
-      return sum + pick.picks.length;
-    }, 0);
-  };
-
-  const getUserPercentage = (userId: string) => {
-    const total = getUserTotalPicks(userId);
-    if (total === 0) return 0;
-    return Math.round((getUserTotalCorrect(userId) / total) * 100);
-  };
+function Leaderboard({ users, currentWeek, snapshot }: LeaderboardProps) {
+  // Standings come ranked from the snapshot scripts/leaderboard_snapshot.py publishes
+  const weeks = snapshot?.weeks || {};
+  const getWeekRecord = (userId: string, week: number) =>
+    (weeks[String(week)] || []).find(record => record.user === userId);
 
   const getUserLast5WeeksPercentage = (userId: string, currentWeek: number) => {
     const last5Weeks = Math.max(1, currentWeek - 5);
-    const recentPicks = picks.filter(p => p.userId === userId && p.week >= last5Weeks && p.week < currentWeek);
-    
-    const recentCorrect = recentPicks.reduce((sum, pick) => {
-      return sum + pick.picks.filter(teamPick => teamPick.correct === true).length;
-    }, 0);
-    const recentTotal = recentPicks.reduce((sum, pick) => sum + pick.picks.length, 0);
-    
+    let recentCorrect = 0;
+    let recentTotal = 0;
+    for (let week = last5Weeks; week < currentWeek; week++) {
+      const record = getWeekRecord(userId, week);
+      if (record) {
+        recentCorrect += record.wins;
+        recentTotal += record.wins + record.losses + record.pushes;
+      }
+    }
+
     if (recentTotal === 0) return 0;
     return Math.round((recentCorrect / recentTotal) * 100);
   };
 
-  // Create leaderboard data with calculated stats
-  const sortedData = users.map(user => ({
-    id: user.id,
-    name: user.name,
-    totalCorrect: getUserTotalCorrect(user.id),
-    totalPicks: getUserTotalPicks(user.id),
-    percentage: getUserPercentage(user.id),
-    last5WeeksPercentage: getUserLast5WeeksPercentage(user.id, currentWeek)
-  })).sort((a, b) => {
-    // Sort by total correct first, then by percentage
-    if (b.totalCorrect !== a.totalCorrect) {
-      return b.totalCorrect - a.totalCorrect;
-    }
-    return b.percentage - a.percentage;
-  });
+  const leaderboardData: LeaderboardUser[] = (snapshot?.standings || []).map(standing => ({
+    id: standing.user,
+    name: users.find(user => user.id === standing.user)?.name || standing.user,
+    totalCorrect: standing.wins,
+    totalPicks: standing.graded_picks,
+    percentage: standing.percentage,
+    last5WeeksPercentage: getUserLast5WeeksPercentage(standing.user, currentWeek),
+    rank: standing.rank,
+    rankChange: standing.rank_change
+  }));
 
-  // Add standard competition ranking (1224 ranking)
-  const leaderboardData: Array<typeof sortedData[0] & { rank: number }> = [];
-  for (let i = 0; i < sortedData.length; i++) {
-    let rank = 1;
-    if (i > 0) {
-      const prevUser = leaderboardData[i - 1];
-      const currentUser = sortedData[i];
-      
-      // If total correct is the same as previous user, use same rank
-      if (prevUser.totalCorrect === currentUser.totalCorrect) {
-        rank = prevUser.rank;
-      } else {
-        rank = i + 1;
-      }
-    }
-    leaderboardData.push({ ...sortedData[i], rank });
+  if (!snapshot) {
+    return <div className="text-center text-gray-500 py-8">Standings are not published yet.</div>;
   }
 
   // Group stats
@@ -1983,6 +2079,14 @@ function Leaderboard({ users, picks, currentWeek }: LeaderboardProps) {
                       {user.rank === 1 && user.percentage > 0 && <span className="text-yellow-500 mr-2">🏆</span>}
                       {user.rank === Math.max(...leaderboardData.map(u => u.rank)) && leaderboardData.length > 1 && <span className="text-red-500 mr-2">🤡</span>}
                       #{user.rank}
+                      {user.rankChange ? (
+                        <span
+                          className={`ml-2 text-xs ${user.rankChange > 0 ? 'text-green-600' : 'text-red-600'}`}
+                          title="Since the previous graded week"
+                        >
+                          {user.rankChange > 0 ? '▲' : '▼'}{Math.abs(user.rankChange)}
+                        </span>
+                      ) : null}
                     </div>
                   </td>
                   <td className="px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">
@@ -2039,15 +2143,14 @@ function Leaderboard({ users, picks, currentWeek }: LeaderboardProps) {
 
               {/* User rows */}
               {leaderboardData.map(user => {
-                const userPicks = picks.filter(p => p.userId === user.id);
                 return (
                   <div key={user.id} className="grid gap-1" style={{ gridTemplateColumns: '80px repeat(' + (currentWeek - 1) + ', 40px)' }}>
                     <div className="text-sm font-medium text-gray-900 p-2 bg-gray-50 rounded">
                       {user.name}
                     </div>
                     {Array.from({ length: currentWeek - 1 }, (_, i) => {
-                      const weekPick = userPicks.find(p => p.week === i + 1);
-                      const correctCount = weekPick ? weekPick.correct : 0;
+                      const weekPick = getWeekRecord(user.id, i + 1);
+                      const correctCount = weekPick ? weekPick.wins : 0;
                       
                       // 4-color palette for 0, 1, 2, 3 correct picks
                       const getColorClass = (count: number) => {
@@ -2116,7 +2219,7 @@ function Leaderboard({ users, picks, currentWeek }: LeaderboardProps) {
       <div className="mt-8 bg-white rounded-lg p-6">
         <h3 className="text-lg font-semibold text-gray-900 mb-4">📈 Cumulative Success Percentage Trends</h3>
         <CumulativeTrendChart 
-          picks={picks} 
+          weeks={weeks} 
           users={leaderboardData} 
           currentWeek={currentWeek} 
         />
@@ -2133,15 +2236,16 @@ interface LeaderboardUser {
   percentage: number;
   last5WeeksPercentage: number;
   rank: number;
+  rankChange: number | null;
 }
 
 interface CumulativeTrendChartProps {
-  picks: Pick[];
+  weeks: {[week: string]: WeekRecord[]};
   users: LeaderboardUser[];
   currentWeek: number;
 }
 
-function CumulativeTrendChart({ picks, users, currentWeek }: CumulativeTrendChartProps) {
+function CumulativeTrendChart({ weeks, users, currentWeek }: CumulativeTrendChartProps) {
   const [highlightedUser, setHighlightedUser] = useState<string | null>(null);
   const [tooltip, setTooltip] = useState<{ x: number; y: number; content: string } | null>(null);
 
@@ -2166,10 +2270,10 @@ function CumulativeTrendChart({ picks, users, currentWeek }: CumulativeTrendChar
       let cumulativePicks = 0;
 
       for (let week = 1; week < currentWeek; week++) {
-        const weekPick = picks.find(p => p.userId === user.id && p.week === week);
-        if (weekPick && weekPick.picks.length > 0) {
-          cumulativeCorrect += weekPick.picks.filter(teamPick => teamPick.correct === true).length;
-          cumulativePicks += weekPick.picks.length;
+        const record = (weeks[String(week)] || []).find(r => r.user === user.id);
+        if (record) {
+          cumulativeCorrect += record.wins;
+          cumulativePicks += record.wins + record.losses + record.pushes;
         }
         
         const percentage = cumulativePicks > 0 ? (cumulativeCorrect / cumulativePicks) * 100 : 0;
@@ -3199,22 +3303,13 @@ function NFLTrends({ games, teamAbbreviations, currentWeek }: NFLTrendsProps) {
       
       for (let week = 1; week <= maxWeekToLoad; week++) {
         try {
-          const weekResponse = await fetch(`${process.env.PUBLIC_URL}/results/nfl_results_week${week}.csv`);
-          const weekText = await weekResponse.text();
-          
-          await new Promise<void>((resolve) => {
-            Papa.parse(weekText, {
-              header: true,
-              complete: (results) => {
-                const weekData = results.data
-                  .filter((row: any) => row.away && row.home) // Filter out empty rows
-                  .map((row: any) => ({ ...row, week }));
-                allResults.push(...weekData);
-                loadedWeeks++;
-                resolve();
-              }
-            });
-          });
+          // Served from the season bundle when available, so this loop makes no requests
+          const rows = await loadCsvRows(`results/nfl_results_week${week}.csv`);
+          const weekData = rows
+            .filter((row: any) => row.away && row.home) // Filter out empty rows
+            .map((row: any) => ({ ...row, week }));
+          allResults.push(...weekData);
+          loadedWeeks++;
         } catch (e) {
           console.log(`Week ${week} results not available`);
         }
@@ -0,0 +1,44 @@
+import Papa from 'papaparse';
+
+// Built by scripts/build_bundle.py: every lines/results/weather CSV keyed by its public/ path
+export interface SeasonBundle {
+  season: number;
+  files: { [path: string]: any[] };
+  teams: { [name: string]: string };
+}
+
+let bundlePromise: Promise<SeasonBundle | null> | null = null;
+
+// The manifest is always revalidated; the bundle name changes with its content so it can be cached
+export const loadSeasonBundle = (): Promise<SeasonBundle | null> => {
+  if (!bundlePromise) {
+    bundlePromise = (async () => {
+      try {
+        const manifestResponse = await fetch(`${process.env.PUBLIC_URL}/data/manifest.json`, { cache: 'no-cache' });
+        if (!manifestResponse.ok) return null;
+        const manifest = await manifestResponse.json();
+        const response = await fetch(`${process.env.PUBLIC_URL}/data/${manifest.bundle}`);
+        if (!response.ok) return null;
+        return (await response.json()) as SeasonBundle;
+      } catch (error) {
+        console.log('Season bundle not available, loading CSV files');
+        return null;
+      }
+    })();
+  }
+  return bundlePromise;
+};
+
+// Rows of a public/ CSV, from the bundle when it has the file, otherwise fetched and parsed
+export const loadCsvRows = async (path: string): Promise<any[]> => {
+  const bundle = await loadSeasonBundle();
+  if (bundle && bundle.files[path]) {
+    return bundle.files[path];
+  }
+  const response = await fetch(`${process.env.PUBLIC_URL}/${path}`);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${path}`);
+  }
+  const csvText = await response.text();
+  return Papa.parse(csvText, { header: true }).data as any[];
+};
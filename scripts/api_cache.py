@@ -0,0 +1,138 @@
+# api_cache.py
+import os, sys, json, time, hashlib, argparse, tempfile, threading
+import datetime as dt
+
+CACHE_DIR = "data/cache/api"
+LEDGER_PATH = "data/cache/quota_ledger.jsonl"
+
+# Seconds a cached response stays fresh, by endpoint kind
+ENDPOINT_TTLS = {
+    "odds": 15 * 60,
+    "scores": 5 * 60,
+    "forecast": 3 * 60 * 60,
+}
+
+# Query params that identify the caller rather than the data
+SECRET_PARAMS = ("apiKey", "appid")
+
+class OfflineCacheMiss(Exception):
+    """Raised in offline mode when a request has no cached response."""
+
+def cache_key(url: str, params: dict) -> str:
+    """Content address for a request: sha256 over the URL and sorted, key-less params."""
+    clean = {k: str(v) for k, v in (params or {}).items() if k not in SECRET_PARAMS}
+    payload = json.dumps([url, sorted(clean.items())], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, url: str, params: dict, ttl: float = None):
+        """Return the cached body, or None if missing or older than `ttl` seconds.
+
+        ttl=None accepts any cached entry regardless of age (used offline).
+        """
+        path = self.path(cache_key(url, params))
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            entry = json.load(f)
+        if ttl is not None and time.time() - entry["fetched_at"] > ttl:
+            return None
+        return entry["body"]
+
+    def put(self, url: str, params: dict, body) -> str:
+        key = cache_key(url, params)
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            "url": url,
+            "params": {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS},
+            "fetched_at": time.time(),
+            "body": body,
+        }
+        # Write atomically so concurrent fetches never leave a torn entry
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        return key
+
+class QuotaLedger:
+    """Append-only record of The Odds API quota headers, one JSON line per response."""
+
+    def __init__(self, path: str = LEDGER_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, url: str, headers) -> dict:
+        remaining = headers.get("x-requests-remaining")
+        if remaining is None:
+            return None
+        entry = {
+            "ts": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "endpoint": url.rsplit("/", 1)[-1],
+            "remaining": _to_int(remaining),
+            "used": _to_int(headers.get("x-requests-used")),
+            "last": _to_int(headers.get("x-requests-last")),
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def entries(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def summary(self) -> dict:
+        """Latest remaining/used counts plus credits spent per endpoint."""
+        entries = self.entries()
+        if not entries:
+            return {}
+        spent = {}
+        for e in entries:
+            spent[e["endpoint"]] = spent.get(e["endpoint"], 0) + (e.get("last") or 0)
+        latest = entries[-1]
+        return {
+            "as_of": latest["ts"],
+            "remaining": latest["remaining"],
+            "used": latest["used"],
+            "calls": len(entries),
+            "spent_by_endpoint": spent,
+        }
+
+def _to_int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect the API response cache and quota ledger.")
+    ap.add_argument("--ledger", default=LEDGER_PATH, help="Quota ledger path.")
+    ap.add_argument("--clear", action="store_true", help="Delete all cached responses.")
+    args = ap.parse_args()
+
+    if args.clear:
+        import shutil
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        print(f"Cleared {CACHE_DIR}")
+
+    summary = QuotaLedger(args.ledger).summary()
+    if not summary:
+        sys.exit(f"No quota entries in {args.ledger}")
+    print(f"As of {summary['as_of']}: {summary['remaining']} requests remaining, {summary['used']} used "
+          f"({summary['calls']} calls logged)")
+    for endpoint, spent in sorted(summary["spent_by_endpoint"].items()):
+        print(f"  {endpoint}: {spent} credits")
+
+if __name__ == "__main__":
+    main()
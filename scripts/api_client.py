@@ -0,0 +1,155 @@
+# api_client.py
+import os
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import MaxRetryError
+from api_cache import ResponseCache, QuotaLedger, OfflineCacheMiss, SECRET_PARAMS
+
+DEFAULT_TIMEOUT = 25
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_sessions = {}
+_lock = threading.Lock()
+
+# Cache settings shared by every fetch in the process; see configure()
+_cache = ResponseCache()
+_ledger = QuotaLedger()
+_settings = {"offline": False, "refresh": False}
+_quota_seen = threading.Event()  # set once a live response in this process reported quota
+_response_hooks = []
+_exchange_hooks = []
+
+# Upstream roots; point these at a local stand-in (scripts/replay.py) to test without quota
+BASE_URLS = {
+    "odds": os.getenv("ODDS_API_BASE_URL", "https://api.the-odds-api.com"),
+    "openweathermap": os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org"),
+}
+
+def base_url(service: str) -> str:
+    return BASE_URLS[service].rstrip("/")
+
+def set_base_url(service: str, url: str):
+    if service not in BASE_URLS:
+        raise ValueError(f"Unknown service {service!r}; expected one of {tuple(BASE_URLS)}")
+    BASE_URLS[service] = url
+
+def add_response_hook(hook):
+    """Register hook(url, status_code, nbytes, retries, seconds) called after every live GET.
+
+    status_code is 0 when no response came back (connection error, timeout).
+    """
+    _response_hooks.append(hook)
+
+def remove_response_hook(hook):
+    if hook in _response_hooks:
+        _response_hooks.remove(hook)
+
+def add_exchange_hook(hook):
+    """Register hook(url, params, response) called with every live response (used for recording)."""
+    _exchange_hooks.append(hook)
+
+def configure(offline: bool = False, refresh: bool = False):
+    """Set process-wide cache behaviour.
+
+    offline serves strictly from the cache (any age) and never touches the
+    network; refresh ignores cached entries but still stores new responses.
+    """
+    _settings["offline"] = offline
+    _settings["refresh"] = refresh
+
+def is_offline() -> bool:
+    return _settings["offline"]
+
+def make_session(retries: int = 3, backoff: float = 0.5, pool_size: int = 10) -> requests.Session:
+    """Build a keep-alive session that retries transient errors with exponential backoff."""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session(name: str = "default") -> requests.Session:
+    """Return the process-wide session for `name`, creating it on first use.
+
+    requests.Session is safe to share across threads for plain GETs, so the
+    worker threads in the fetch layers all reuse the same connection pool.
+    """
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = _sessions[name] = make_session()
+        return session
+
+def get_json(url: str, params: dict, timeout: float = DEFAULT_TIMEOUT,
+             session: requests.Session = None, ttl: float = None):
+    """GET `url` over the shared session and return the decoded JSON body.
+
+    When `ttl` is given the response is served from, and stored in, the
+    on-disk cache. Quota headers are logged to the ledger on every live call.
+    """
+    if _settings["offline"]:
+        body = _cache.get(url, params)
+        if body is None:
+            shown = {k: v for k, v in params.items() if k not in SECRET_PARAMS}
+            raise OfflineCacheMiss(f"No cached response for {url} {shown}")
+        return body
+    if ttl is not None and not _settings["refresh"]:
+        body = _cache.get(url, params, ttl)
+        if body is not None:
+            return body
+
+    session = session or get_session()
+    started = time.perf_counter()
+    try:
+        r = session.get(url, params=params, timeout=timeout)
+    except requests.RequestException as e:
+        # Exhausted retries, connection errors and timeouts must be counted too
+        status = e.response.status_code if e.response is not None else 0
+        _notify(url, status, 0, _retries_spent(session, url, e), time.perf_counter() - started)
+        raise
+    if _response_hooks:
+        # urllib3 records each retried attempt on the final response
+        history = getattr(getattr(r.raw, "retries", None), "history", None) or ()
+        _notify(url, r.status_code, len(r.content), len(history), time.perf_counter() - started)
+    for hook in _exchange_hooks:
+        hook(url, params, r)
+    r.raise_for_status()
+    if _ledger.record(url, r.headers):
+        _quota_seen.set()
+    body = r.json()
+    if ttl is not None:
+        _cache.put(url, params, body)
+    return body
+
+def _notify(url, status, nbytes, retries, seconds):
+    for hook in _response_hooks:
+        hook(url, status, nbytes, retries, seconds)
+
+def _retries_spent(session, url, error) -> int:
+    """Retries used before a request failed outright.
+
+    urllib3 only raises MaxRetryError once the budget is spent (the error
+    carries no history), so that means every configured retry was used.
+    """
+    if error.args and isinstance(error.args[0], MaxRetryError):
+        return session.get_adapter(url).max_retries.total or 0
+    return 0
+
+def quota_summary() -> dict:
+    """Ledger summary, or {} if no live call in this process reported quota (all cached)."""
+    if not _quota_seen.is_set():
+        return {}
+    return _ledger.summary()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Build the frontend season bundle.
+
+Compiles every lines/results CSV, the weather forecast and the team
+abbreviations under nfl-pickem/public into one minified, content-hashed JSON
+file plus a small manifest pointing at it. The app fetches the manifest
+(never cached) and then the bundle (cacheable forever, since its name
+changes with its content) instead of one CSV per week.
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+import hashlib
+import argparse
+import datetime as dt
+import pandas as pd
+import yaml
+
+import season_store
+
+PUBLIC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nfl-pickem', 'public'))
+BUNDLE_DIR = "data"
+MANIFEST = "manifest.json"
+# public/-relative CSVs that go into the bundle, keyed by the path the app fetches them from
+CSV_GLOBS = ["lines/*.csv", "results/*.csv", "weather_forecast.csv"]
+HASH_LENGTH = 12
+
+def csv_rows(path):
+    """Rows exactly as the app's CSV parser sees them: every value a string, blanks as ""."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return df.to_dict("records")
+
+def build_bundle(public_dir=PUBLIC_DIR, season=season_store.SEASON):
+    """Bundle dict: {season, files: {path: rows}, teams}."""
+    files = {}
+    for pattern in CSV_GLOBS:
+        for path in sorted(glob.glob(os.path.join(public_dir, pattern))):
+            rel = os.path.relpath(path, public_dir).replace(os.sep, "/")
+            files[rel] = csv_rows(path)
+    with open(os.path.join(public_dir, "teamAbbreviations.yaml"), "r") as f:
+        teams = yaml.safe_load(f)["teams"]
+    return {"season": season, "files": files, "teams": teams}
+
+def write_bundle(bundle, public_dir=PUBLIC_DIR):
+    """Write season.<hash>.json and the manifest; stale bundles are removed."""
+    out_dir = os.path.join(public_dir, BUNDLE_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    body = json.dumps(bundle, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+    name = f"season{bundle['season']}.{digest}.json"
+    path = os.path.join(out_dir, name)
+    if not os.path.exists(path):
+        with open(path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)
+    for old in glob.glob(os.path.join(out_dir, f"season{bundle['season']}.*.json")):
+        if os.path.basename(old) != name:
+            os.remove(old)
+
+    manifest = {
+        "season": bundle["season"],
+        "bundle": name,
+        "hash": digest,
+        "bytes": len(body),
+        "files": len(bundle["files"]),
+        "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+    }
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return path, manifest, len(gzip.compress(body))
+
+def main():
+    ap = argparse.ArgumentParser(description="Compile the frontend's CSV/YAML data into one content-hashed season bundle.")
+    ap.add_argument("--public-dir", default=PUBLIC_DIR, help="React public/ directory (default: nfl-pickem/public)")
+    ap.add_argument("--season", type=int, default=season_store.SEASON)
+    args = ap.parse_args()
+
+    bundle = build_bundle(args.public_dir, args.season)
+    if not bundle["files"]:
+        sys.exit(f"No CSVs found under {args.public_dir}")
+    path, manifest, gz_bytes = write_bundle(bundle, args.public_dir)
+    print(f"Bundled {manifest['files']} files -> {path}")
+    print(f"  {manifest['bytes'] / 1024:.0f} KB ({gz_bytes / 1024:.0f} KB gzipped)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# forecast_grid.py
+import numpy as np
+import pandas as pd
+
+GAME_HOURS = 3.5           # kickoff to final whistle, roughly
+WINDOW_STEP_MINUTES = 30   # sampling step across the game window
+
+# Numeric forecast fields pulled from each OpenWeatherMap 3-hour slot
+FIELDS = {
+    'temp': lambda s: s['main']['temp'],
+    'feels_like': lambda s: s['main']['feels_like'],
+    'humidity': lambda s: s['main']['humidity'],
+    'wind_speed': lambda s: s['wind']['speed'],
+    'wind_gust': lambda s: s['wind'].get('gust', 0),
+    'pop': lambda s: s.get('pop', 0),
+    'rain_3h': lambda s: s.get('rain', {}).get('3h', 0),
+    'snow_3h': lambda s: s.get('snow', {}).get('3h', 0),
+}
+
+COLUMNS = ['temp_f', 'feels_like_f', 'humidity_pct', 'wind_mph', 'gust_mph', 'precip_pct',
+           'rain_in', 'snow_in', 'min_temp_f', 'max_wind_mph', 'max_gust_mph', 'max_precip_pct',
+           'condition', 'description']
+
+def build_grid(forecasts):
+    """Stack {key: forecast JSON} into aligned arrays.
+
+    Returns (keys, times, values, conditions): times is [venues, slots] of
+    unix seconds padded with +inf, values maps each field to a [venues, slots]
+    float array padded with NaN, and conditions holds (main, description)
+    tuples per slot for the categorical weather.
+    """
+    keys = [k for k, f in forecasts.items() if f and f.get('list')]
+    width = max((len(forecasts[k]['list']) for k in keys), default=0)
+    times = np.full((len(keys), width), np.inf)
+    values = {name: np.full((len(keys), width), np.nan) for name in FIELDS}
+    conditions = []
+    for i, key in enumerate(keys):
+        slots = forecasts[key]['list']
+        times[i, :len(slots)] = [s['dt'] for s in slots]
+        for name, get in FIELDS.items():
+            values[name][i, :len(slots)] = [get(s) for s in slots]
+        conditions.append([(s['weather'][0]['main'], s['weather'][0]['description']) for s in slots])
+    return keys, times, values, conditions
+
+def interpolate(times, values, rows, targets):
+    """Linearly interpolate `values` for venue `rows` at `targets` (unix seconds).
+
+    rows is [n] and targets is [n] or [n, k]; targets outside a venue's
+    forecast range are clamped to its first/last slot.
+    """
+    targets = np.asarray(targets, dtype=float)
+    t = times[rows]
+    v = values[rows]
+    counts = np.isfinite(t).sum(axis=1)
+    flat = targets.reshape(len(rows), -1)
+
+    # Index of the first slot at or after each target, per venue row
+    hi = np.clip((t[:, None, :] < flat[:, :, None]).sum(axis=2), 1, np.maximum(counts - 1, 1)[:, None])
+    lo = hi - 1
+    r = np.arange(len(rows))[:, None]
+    t0, t1 = t[r, lo], t[r, hi]
+    v0, v1 = v[r, lo], v[r, hi]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        w = np.clip((flat - t0) / (t1 - t0), 0, 1)
+    w = np.where(np.isfinite(w), w, 0)
+    # w == 0 also covers single-slot venues whose padded neighbour is NaN
+    out = np.where(w == 0, v0, v0 + w * (v1 - v0))
+    return out.reshape(targets.shape)
+
+def nearest_slot(times, rows, targets):
+    """Index of the slot closest to each target, per venue row."""
+    t = times[rows]
+    return np.argmin(np.abs(t - np.asarray(targets, dtype=float)[:, None]), axis=1)
+
+def game_conditions(forecasts, games):
+    """Conditions at kickoff and across the game window for every game at once.
+
+    `games` is a list of (venue_key, kickoff datetime or None); a missing
+    kickoff uses the venue's first forecast slot. Returns a DataFrame with one
+    row per game (NaN where the venue has no forecast).
+    """
+    keys, times, values, conditions = build_grid(forecasts)
+    row_of = {k: i for i, k in enumerate(keys)}
+    known = np.array([key in row_of for key, _ in games], dtype=bool)
+    rows = np.array([row_of.get(key, 0) for key, _ in games], dtype=int)
+    if not len(keys) or not len(games):
+        return pd.DataFrame(np.nan, index=range(len(games)), columns=COLUMNS)
+    out = pd.DataFrame(index=range(len(games)))
+
+    kickoff = np.array([k.timestamp() if k is not None else np.nan for _, k in games], dtype=float)
+    kickoff = np.where(np.isnan(kickoff), times[rows, 0], kickoff)
+    steps = np.arange(0, GAME_HOURS * 60 + 1, WINDOW_STEP_MINUTES) * 60
+    window = kickoff[:, None] + steps[None, :]
+
+    at = {name: interpolate(times, values[name], rows, kickoff) for name in FIELDS}
+    across = {name: interpolate(times, values[name], rows, window)
+              for name in ('temp', 'wind_speed', 'wind_gust', 'pop')}
+    slot = nearest_slot(times, rows, kickoff)
+
+    out['temp_f'] = at['temp']
+    out['feels_like_f'] = at['feels_like']
+    out['humidity_pct'] = at['humidity']
+    out['wind_mph'] = at['wind_speed']
+    out['gust_mph'] = at['wind_gust']
+    out['precip_pct'] = at['pop'] * 100
+    # Precipitation amounts are 3-hour totals, so take the slot rather than interpolating
+    out['rain_in'] = values['rain_3h'][rows, slot]
+    out['snow_in'] = values['snow_3h'][rows, slot]
+    out['min_temp_f'] = across['temp'].min(axis=1)
+    out['max_wind_mph'] = across['wind_speed'].max(axis=1)
+    out['max_gust_mph'] = across['wind_gust'].max(axis=1)
+    out['max_precip_pct'] = across['pop'].max(axis=1) * 100
+    out['condition'] = [conditions[r][s][0] for r, s in zip(rows, slot)]
+    out['description'] = [conditions[r][s][1] for r, s in zip(rows, slot)]
+    out.loc[~known] = np.nan
+    return out
+
+def summarize(row):
+    """Weather summary text for the game, e.g. "38°F (feels 30°F) | Windy (14mph)".
+
+    Temperature is at kickoff; wind and rain use the worst point of the game window.
+    """
+    if pd.isna(row['temp_f']):
+        return "Weather data unavailable"
+    temp = round(row['temp_f'])
+    feels_like = round(row['feels_like_f'])
+    wind_speed = round(row['max_wind_mph'])
+    wind_gust = round(row['max_gust_mph'])
+    rain_chance = row['max_precip_pct']
+
+    summary_parts = []
+    if abs(temp - feels_like) > 5:
+        summary_parts.append(f"{temp}°F (feels {feels_like}°F)")
+    else:
+        summary_parts.append(f"{temp}°F")
+
+    if rain_chance > 20:
+        if row['rain_in'] > 0:
+            summary_parts.append(f"{rain_chance:.0f}% chance rain ({row['rain_in']:.2f}\")")
+        else:
+            summary_parts.append(f"{rain_chance:.0f}% chance rain")
+
+    if row['snow_in'] > 0:
+        summary_parts.append(f"Snow expected ({row['snow_in']:.2f}\")")
+
+    if wind_speed > 10 or wind_gust > 15:
+        if wind_gust > wind_speed + 5:
+            summary_parts.append(f"Windy ({wind_speed}mph, gusts {wind_gust}mph)")
+        else:
+            summary_parts.append(f"Windy ({wind_speed}mph)")
+
+    if str(row['condition']).lower() in ['thunderstorm', 'snow', 'fog', 'mist']:
+        summary_parts.append(str(row['description']).title())
+
+    return " | ".join(summary_parts)
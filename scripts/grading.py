@@ -0,0 +1,229 @@
+# grading.py
+import numpy as np
+import pandas as pd
+
+GAME_KEYS = ("home", "away")
+EVENT_KEY = "game_id"  # Odds API event id, carried by lines (build_frame) and scores
+
+ATS_COLUMNS = ["kickoff_et", "away", "home", "away_score", "home_score",
+               "actual_margin", "home_spread", "away_spread",
+               "home_ats_margin", "home_ats_result", "away_ats_result",
+               "total", "actual_total", "over_under"]
+
+def ats_outcome(margin):
+    """Map ATS margins to W/L/P (positive margin covers, zero pushes)."""
+    margin = np.asarray(margin, dtype=float)
+    return np.select([margin > 0, margin < 0], ["W", "L"], default="P")
+
+def grade_ats(results_df: pd.DataFrame, odds_df: pd.DataFrame, keys=GAME_KEYS, warn: bool = True) -> pd.DataFrame:
+    """Grade final scores against the lines in one keyed merge.
+
+    `keys` are the columns that identify a game in both frames. For a single
+    week that is home/away; pass e.g. ("week", "home", "away") to grade a whole
+    season (or ("league", "week", "home", "away") for many leagues) at once.
+    Extra key columns are kept at the front of the output. Where the lines
+    list a matchup more than once, the first row wins.
+
+    When both frames carry the event id (game_id), games are matched on it
+    instead, so rematches and neutral-site games can't be confused; games
+    without a matching id (legacy weeks) fall back to `keys`. The id is then
+    kept as the last output column.
+    """
+    keys = list(keys)
+    lines = ["spread_home", "spread_away", "total"]
+    odds = (odds_df[keys + lines]
+            .drop_duplicates(subset=keys, keep="first"))
+    merged = results_df.merge(odds, on=keys, how="left", indicator=True)
+    keyed = EVENT_KEY in results_df.columns and EVENT_KEY in odds_df.columns
+    if keyed:
+        by_id = odds_df.loc[odds_df[EVENT_KEY].notna(), [EVENT_KEY] + lines].drop_duplicates(EVENT_KEY)
+        by_id = by_id.set_index(by_id[EVENT_KEY].astype(str))[lines]
+        by_id = results_df[EVENT_KEY].astype(str).to_frame().join(by_id, on=EVENT_KEY)
+        hit = by_id["spread_home"].notna() | by_id["total"].notna()
+        # Row order is unchanged by the left merge above, so positions line up
+        hit_rows = hit.to_numpy()
+        merged.loc[hit_rows, lines] = by_id.loc[hit, lines].to_numpy()
+        merged.loc[hit_rows, "_merge"] = "both"
+
+    missing = merged["_merge"] == "left_only"
+    if warn:
+        for _, row in merged.loc[missing, ["away", "home"]].iterrows():
+            print(f"Warning: No odds found for {row['away']} @ {row['home']}")
+    merged = merged.loc[~missing].reset_index(drop=True)
+    if merged.empty:
+        return pd.DataFrame()
+
+    home_score = merged["home_score"].to_numpy()
+    away_score = merged["away_score"].to_numpy()
+    actual_margin = home_score - away_score
+    home_spread = merged["spread_home"].fillna(0).to_numpy(dtype=float)
+    away_spread = merged["spread_away"].fillna(0).to_numpy(dtype=float)
+    total = merged["total"].to_numpy(dtype=float)
+    actual_total = home_score + away_score
+
+    home_ats_margin = actual_margin + home_spread
+    home_ats_result = ats_outcome(home_ats_margin)
+    away_ats_result = ats_outcome(-home_ats_margin)
+
+    has_total = ~np.isnan(total)
+    over_under = np.select(
+        [has_total & (actual_total > total), has_total & (actual_total < total), has_total],
+        ["Over", "Under", "Push"], default=None)
+
+    extra = [k for k in keys if k not in GAME_KEYS]
+    out = merged[extra + ["kickoff_et", "away", "home", "away_score", "home_score"]].copy()
+    out["actual_margin"] = actual_margin
+    out["home_spread"] = home_spread
+    out["away_spread"] = away_spread
+    out["home_ats_margin"] = home_ats_margin
+    out["home_ats_result"] = home_ats_result
+    out["away_ats_result"] = away_ats_result
+    out["total"] = total
+    out["actual_total"] = actual_total
+    out["over_under"] = over_under
+    if keyed:
+        out[EVENT_KEY] = merged[EVENT_KEY].to_numpy()
+        return out[extra + ATS_COLUMNS + [EVENT_KEY]]
+    return out[extra + ATS_COLUMNS]
+
+def _game_date(kickoff: pd.Series) -> pd.Series:
+    """Local (ET) calendar date of each kickoff as YYYY-MM-DD."""
+    if pd.api.types.is_datetime64_any_dtype(kickoff):
+        return kickoff.dt.strftime("%Y-%m-%d")
+    # Datetime objects or "2025-12-07 13:00:00-05:00" strings both start with the local date
+    return kickoff.astype(str).str[:10]
+
+def build_team_index(ats_results_df: pd.DataFrame, keys=()) -> pd.DataFrame:
+    """One row per (keys..., team) with that team's opponent, ATS result and game date.
+
+    Also carries the team's own line and its final margin (points for minus
+    points against) so picks can be regraded against a different spread.
+
+    If a team appears in more than one game, its first game in the ATS table
+    is used, matching the old per-pick scan.
+    """
+    keys = list(keys)
+    base = ats_results_df.reset_index(drop=True)
+    game_date = _game_date(base["kickoff_et"])
+    sides = []
+    for side, other in (("home", "away"), ("away", "home")):
+        part = base[keys].copy()
+        part["team"] = base[side]
+        part["opponent"] = base[other]
+        part["result"] = base[f"{side}_ats_result"]
+        part["game_date"] = game_date
+        part["line"] = base[f"{side}_spread"]
+        part["margin"] = base[f"{side}_score"] - base[f"{other}_score"]
+        part["_order"] = base.index
+        sides.append(part)
+    index = pd.concat(sides, ignore_index=True).sort_values("_order", kind="stable")
+    index = index.drop_duplicates(subset=keys + ["team"], keep="first")
+    return index.drop(columns="_order").set_index(keys + ["team"])
+
+def pick_event_ids(picks_df: pd.DataFrame, lines_df: pd.DataFrame, keys=()) -> pd.Series:
+    """Odds API event id for each pick, from the frontend's row-number game_id.
+
+    The app numbers games by their row in the lines CSV ("3", "playoff-3",
+    with "-ou" on totals picks), per `keys` group (e.g. week) when several
+    weeks are stacked. Picks that can't be resolved get NaN.
+    """
+    keys = list(keys)
+    if EVENT_KEY not in lines_df.columns or EVENT_KEY not in picks_df.columns:
+        return pd.Series(np.nan, index=picks_df.index, dtype=object)
+    row = pd.to_numeric(picks_df[EVENT_KEY].astype(str).str.extract(r"^(?:playoff-)?(\d+)(?:-ou)?$")[0],
+                        errors="coerce")
+    lines = lines_df[keys + [EVENT_KEY]].copy()
+    lines["_row"] = lines.groupby(keys).cumcount() + 1 if keys else np.arange(1, len(lines) + 1)
+    lookup = lines.set_index(keys + ["_row"])[EVENT_KEY]
+    wanted = picks_df[keys].assign(_row=row)
+    return wanted.join(lookup, on=keys + ["_row"])[EVENT_KEY]
+
+def _join_picks(ats_results_df, picks, keys, event_ids=None):
+    """Join picks to the team index, by event id where it resolves and by team otherwise."""
+    index = build_team_index(ats_results_df, keys)
+    if event_ids is None or EVENT_KEY not in ats_results_df.columns:
+        return picks.join(index, on=keys + ["team"], how="left")
+
+    by_event = build_team_index(ats_results_df.dropna(subset=[EVENT_KEY]), keys + [EVENT_KEY])
+    joined = picks.assign(**{EVENT_KEY: event_ids}).join(by_event, on=keys + [EVENT_KEY, "team"], how="left")
+    joined = joined.drop(columns=EVENT_KEY)
+    # Legacy weeks (no ids in the lines) and unmapped picks use the team match
+    fallback = joined["result"].isna()
+    if fallback.any():
+        matched = picks.loc[fallback].join(index, on=keys + ["team"], how="left")
+        joined.loc[fallback, index.columns] = matched[index.columns]
+    return joined
+
+def grade_picks(ats_results_df: pd.DataFrame, picks_df: pd.DataFrame, keys=(), warn: bool = True,
+                lines_df: pd.DataFrame = None) -> pd.DataFrame:
+    """Resolve every pick against the team index in one join.
+
+    Pass the week's `lines_df` to match picks to games by event id (see
+    pick_event_ids) rather than by team name alone. Returns user, team,
+    opponent, result, game_date in pick order; picks whose team has no
+    graded game are reported and dropped.
+    """
+    keys = list(keys)
+    event_ids = pick_event_ids(picks_df, lines_df, keys) if lines_df is not None else None
+    joined = _join_picks(ats_results_df, picks_df[keys + ["user", "team"]], keys, event_ids)
+
+    missing = joined["result"].isna()
+    if warn:
+        for _, pick in joined.loc[missing].iterrows():
+            print(f"Warning: No result found for {pick['user']}'s pick: {pick['team']}")
+    joined = joined.loc[~missing].reset_index(drop=True)
+    return joined[keys + ["user", "team", "opponent", "result", "game_date"]]
+
+def grade_locked_picks(ats_results_df: pd.DataFrame, picks_df: pd.DataFrame, keys=(), warn: bool = True,
+                       lines_df: pd.DataFrame = None) -> pd.DataFrame:
+    """Grade every pick against its own locked spread in one join.
+
+    picks_df has user, team and spread (the line for the picked team when the
+    pick was made). Picks without a spread fall back to the line the ATS table
+    was graded with; `lines_df` matches picks by event id as in grade_picks.
+    Returns user, team, opponent, spread, result, game_date, indexed like
+    picks_df so results can be joined back to the picks.
+    """
+    keys = list(keys)
+    picks = picks_df[keys + ["user", "team"]].copy()
+    picks["spread"] = pd.to_numeric(picks_df["spread"], errors="coerce") if "spread" in picks_df else np.nan
+    event_ids = pick_event_ids(picks_df, lines_df, keys) if lines_df is not None else None
+    joined = _join_picks(ats_results_df, picks, keys, event_ids)
+
+    missing = joined["result"].isna()
+    if warn:
+        for _, pick in joined.loc[missing].iterrows():
+            print(f"Warning: No result found for {pick['user']}'s pick: {pick['team']}")
+    joined = joined.loc[~missing].copy()
+
+    joined["spread"] = joined["spread"].fillna(joined["line"])
+    joined["result"] = ats_outcome(joined["margin"] + joined["spread"])
+    return joined[keys + ["user", "team", "opponent", "spread", "result", "game_date"]]
+
+def live_cover_status(games_df: pd.DataFrame, picks_df: pd.DataFrame) -> pd.DataFrame:
+    """Current cover status of every spread pick against its own stored spread.
+
+    games_df has home/away scores and a completed flag (in-progress games
+    included); picks_df has user, team and spread. Status is covering /
+    push / not covering while a game is live, and W / P / L once it is final.
+    O/U picks are skipped.
+    """
+    base = games_df.reset_index(drop=True)
+    sides = []
+    for side, other in (("home", "away"), ("away", "home")):
+        sides.append(pd.DataFrame({
+            "team": base[side], "opponent": base[other],
+            "score": base[f"{side}_score"], "opponent_score": base[f"{other}_score"],
+            "completed": base["completed"].astype(bool),
+        }))
+    index = pd.concat(sides, ignore_index=True).drop_duplicates(subset="team").set_index("team")
+
+    picks = picks_df.loc[~picks_df["team"].astype(str).str.startswith("O/U:"), ["user", "team", "spread"]]
+    live = picks.join(index, on="team", how="inner")
+    margin = (live["score"] - live["opponent_score"] + live["spread"].astype(float)).to_numpy(dtype=float)
+    final = live["completed"].to_numpy(dtype=bool)
+    status = np.where(final, ats_outcome(margin),
+                      np.select([margin > 0, margin < 0], ["covering", "not covering"], default="push"))
+    live = live.assign(margin=margin, status=status)
+    return live[["user", "team", "opponent", "spread", "score", "opponent_score",
+                 "margin", "completed", "status"]].reset_index(drop=True)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Precomputed leaderboard snapshot.
+
+Builds the regular-season standings (record over graded weeks, percentage,
+rank and rank change since the previous graded week) and each week's W-L-P
+from the picks table, and publishes them to the Supabase `snapshots` row the frontend reads in one
+request. Supabase assigns each publish the next version; a local copy of
+every version is kept under data/leaderboard/.
+"""
+
+import os
+import sys
+import json
+import argparse
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from season_store import PLAYOFF_WEEKS
+from supabase_integration import fetch_all_picks, store_snapshot
+
+SNAPSHOT_NAME = "leaderboard"  # row in the snapshots table (sql/snapshots.sql)
+HISTORY_DIR = "data/leaderboard"
+
+def standings_table(records: pd.DataFrame) -> pd.DataFrame:
+    """Standings from weekly records; the app's Leaderboard tab shows them as is.
+
+    Only graded weeks count: percentage is wins over graded picks (pushes
+    included), users are ordered by wins then percentage, and users with the
+    same number of wins share a rank (1, 2, 2, 4).
+    """
+    table = records.groupby("user", as_index=False)[["wins", "losses", "pushes", "pending"]].sum()
+    table["graded_picks"] = table["wins"] + table["losses"] + table["pushes"]
+    graded = table["graded_picks"].where(table["graded_picks"] > 0)
+    table["percentage"] = (table["wins"] / graded * 100).round().fillna(0).astype(int)
+    table = table.sort_values(["wins", "percentage", "user"], ascending=[False, False, True]).reset_index(drop=True)
+    tied = table["wins"].duplicated()
+    table["rank"] = pd.Series(np.arange(1, len(table) + 1)).where(~tied).ffill().astype(int)
+    return table
+
+def weekly_records(picks_df: pd.DataFrame) -> pd.DataFrame:
+    """W-L-P and pending counts per user and week."""
+    correct = picks_df["correct"]
+    graded_weeks = picks_df.loc[correct.notna(), "week"].unique()
+    flags = pd.DataFrame({
+        "week": picks_df["week"].astype(int),
+        "user": picks_df["user_id"],
+        "wins": (correct == True).astype(int),
+        "losses": (correct == False).astype(int),
+        "pushes": (correct.isna() & picks_df["week"].isin(graded_weeks)).astype(int),
+        "pending": (correct.isna() & ~picks_df["week"].isin(graded_weeks)).astype(int),
+    })
+    return flags.groupby(["week", "user"], as_index=False).sum()
+
+def build_snapshot(picks_df: pd.DataFrame) -> dict:
+    """Standings dict from picks with user_id, week and correct columns."""
+    records = weekly_records(picks_df)
+    regular = records[records["week"] < min(PLAYOFF_WEEKS.values())]
+    graded = sorted(regular.loc[regular[["wins", "losses", "pushes"]].sum(axis=1) > 0, "week"].unique())
+    through_week = int(graded[-1]) if graded else None
+
+    overall = standings_table(regular)
+    if len(graded) > 1:
+        previous = standings_table(regular[regular["week"] < through_week]).set_index("user")["rank"]
+        # Positive means the user moved up since the previous graded week
+        overall["rank_change"] = overall["user"].map(previous) - overall["rank"]
+    else:
+        overall["rank_change"] = np.nan
+
+    standings = []
+    for row in overall.itertuples(index=False):
+        standings.append({
+            "rank": int(row.rank),
+            "rank_change": None if pd.isna(row.rank_change) else int(row.rank_change),
+            "user": row.user,
+            "wins": int(row.wins),
+            "losses": int(row.losses),
+            "pushes": int(row.pushes),
+            "pending": int(row.pending),
+            "graded_picks": int(row.graded_picks),
+            "percentage": int(row.percentage),
+        })
+
+    weeks = {}
+    for week, week_records in records.groupby("week"):
+        weeks[str(week)] = [{"user": r.user, "wins": int(r.wins), "losses": int(r.losses),
+                             "pushes": int(r.pushes), "pending": int(r.pending)}
+                            for r in week_records.itertuples(index=False)]
+
+    return {"through_week": through_week, "standings": standings, "weeks": weeks}
+
+def write_snapshot(snapshot: dict, name: str = SNAPSHOT_NAME, history_dir: str = HISTORY_DIR) -> dict:
+    """Publish the snapshot to Supabase and keep a local copy under the version it was given."""
+    version = store_snapshot(name, snapshot)
+    snapshot = {
+        "version": version,
+        "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        **snapshot,
+    }
+    target = os.path.join(history_dir, f"{name}_v{version}.json")
+    os.makedirs(history_dir, exist_ok=True)
+    with open(target + ".tmp", "w") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(target + ".tmp", target)
+    return snapshot
+
+def publish_snapshot(name: str = SNAPSHOT_NAME) -> dict:
+    """Read the picks once (projected) and publish a fresh snapshot; returns it, or None on failure."""
+    try:
+        picks_df = fetch_all_picks(["user_id", "week", "correct"])
+        if picks_df.empty:
+            return None
+        snapshot = write_snapshot(build_snapshot(picks_df), name)
+    except Exception as e:
+        print(f"Could not publish leaderboard snapshot: {e}")
+        return None
+    print(f"Leaderboard snapshot v{snapshot['version']} (through week {snapshot['through_week']}) "
+          f"-> snapshots/{name}")
+    return snapshot
+
+def main():
+    ap = argparse.ArgumentParser(description="Publish the precomputed leaderboard snapshot from the picks table.")
+    ap.add_argument("--name", default=SNAPSHOT_NAME, help=f"Snapshots row to publish to (default: {SNAPSHOT_NAME})")
+    args = ap.parse_args()
+
+    snapshot = publish_snapshot(args.name)
+    if snapshot is None:
+        sys.exit("Snapshot not published (no picks, or Supabase unavailable).")
+    for row in snapshot["standings"]:
+        change = row["rank_change"]
+        arrow = "" if not change else (f" (+{change})" if change > 0 else f" ({change})")
+        print(f"{row['rank']:>2}. {row['user']}: {row['wins']}-{row['losses']}-{row['pushes']} "
+              f"({row['percentage']}%){arrow}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# line_history.py
+import os, sys, json, bisect, argparse, datetime as dt
+import numpy as np
+import pandas as pd
+
+HISTORY_DIR = "data/lines/history"
+KEYFRAME_EVERY = 24  # full snapshot every N appends so as-of lookups replay a bounded tail
+
+# Per-game fields tracked over time (everything build_frame writes except the matchup)
+LINE_FIELDS = ["kickoff_et",
+               "spread_away", "spread_away_price", "spread_home", "spread_home_price",
+               "total", "over_price", "under_price",
+               "ml_away", "ml_home",
+               "spreads_book", "totals_book", "h2h_book"]
+
+def history_path(week, history_dir=HISTORY_DIR):
+    return os.path.join(history_dir, f"week{week}.jsonl")
+
+def game_key(away, home):
+    return f"{away} @ {home}"
+
+def _parse_ts(ts):
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    stamp = pd.Timestamp(ts)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize("UTC")
+    return stamp.timestamp()
+
+def _value(v):
+    """JSON-safe scalar: NaN/NA become None, numpy numbers become plain floats."""
+    if v is None or (not isinstance(v, str) and pd.isna(v)):
+        return None
+    if isinstance(v, (pd.Timestamp, dt.datetime)):
+        return v.isoformat()
+    if isinstance(v, str):
+        return v
+    return float(v)
+
+def frame_state(df):
+    """{game key: {field: value}} for a lines frame."""
+    fields = [f for f in LINE_FIELDS if f in df.columns]
+    state = {}
+    for row in df[["away", "home"] + fields].itertuples(index=False):
+        row = row._asdict()
+        state[game_key(row["away"], row["home"])] = {f: _value(row[f]) for f in fields}
+    return state
+
+def diff_state(prev, current):
+    """Only the games and fields whose value changed since `prev`."""
+    delta = {}
+    for key, fields in current.items():
+        old = prev.get(key, {})
+        changed = {f: v for f, v in fields.items() if f not in old or old[f] != v}
+        if changed:
+            delta[key] = changed
+    return delta
+
+class LineHistory:
+    """Append-only, delta-encoded line snapshots for one week.
+
+    Each JSONL record is {"ts", "full", "games"}: a keyframe ("full": true)
+    holds every game's fields, other records only what moved since the
+    previous fetch. Records are in fetch order, so as-of lookups bisect on
+    the timestamps and replay from the nearest keyframe at or before them.
+    """
+
+    def __init__(self, week, history_dir=HISTORY_DIR):
+        self.week = week
+        self.path = history_path(week, history_dir)
+        self.records = []
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                self.records = [json.loads(line) for line in f if line.strip()]
+        self.times = [_parse_ts(r["ts"]) for r in self.records]
+        self.keyframes = [i for i, r in enumerate(self.records) if r["full"]]
+
+    def __len__(self):
+        return len(self.records)
+
+    def _replay(self, end, key=None):
+        """State after record `end` (inclusive), optionally for a single game."""
+        if end < 0:
+            return {}
+        start = self.keyframes[bisect.bisect_right(self.keyframes, end) - 1]
+        state = {}
+        for record in self.records[start:end + 1]:
+            games = record["games"]
+            if key is not None:
+                games = {key: games[key]} if key in games else {}
+            for k, fields in games.items():
+                state.setdefault(k, {}).update(fields)
+        return state
+
+    def latest(self):
+        return self._replay(len(self.records) - 1)
+
+    def append(self, df, ts=None):
+        """Record a fetched lines frame; returns the number of games that moved.
+
+        Nothing is written when no line changed, except that the first record
+        and every KEYFRAME_EVERY-th record are full snapshots.
+        """
+        ts = ts or dt.datetime.now(dt.timezone.utc)
+        ts_value = _parse_ts(ts)
+        if self.times and ts_value < self.times[-1]:
+            raise ValueError(f"Snapshot at {ts} is older than the last recorded fetch")
+        current = frame_state(df)
+        delta = diff_state(self.latest(), current)
+        full = not self.records or len(self.records) - self.keyframes[-1] >= KEYFRAME_EVERY
+        if not delta and not full:
+            return 0
+        record = {
+            "ts": pd.Timestamp(ts_value, unit="s", tz="UTC").isoformat(),
+            "full": full,
+            "games": current if full else delta,
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        if full:
+            self.keyframes.append(len(self.records))
+        self.records.append(record)
+        self.times.append(ts_value)
+        return len(delta)
+
+    def as_of(self, ts, key=None):
+        """Lines as they stood at `ts`: {game: fields}, or one game's fields if `key` is given."""
+        end = bisect.bisect_right(self.times, _parse_ts(ts)) - 1
+        state = self._replay(end, key)
+        return state.get(key) if key is not None else state
+
+    def frame_as_of(self, ts):
+        """as_of() as a lines-CSV-shaped DataFrame."""
+        state = self.as_of(ts)
+        rows = []
+        for key, fields in state.items():
+            away, _, home = key.partition(" @ ")
+            rows.append({"away": away, "home": home, **fields})
+        df = pd.DataFrame(rows, columns=["away", "home"] + LINE_FIELDS)
+        return df[["kickoff_et"] + [c for c in df.columns if c != "kickoff_et"]]
+
+    def pick_spreads(self, picks_df, ts_column="created_at"):
+        """Spread for each pick's team as of its timestamp (NaN if unknown).
+
+        Picks are bucketed by the snapshot in force at their timestamp, so the
+        board is replayed once per distinct snapshot rather than once per pick.
+        """
+        spreads = pd.Series(np.nan, index=picks_df.index, dtype=float)
+        if not self.records or ts_column not in picks_df.columns:
+            return spreads
+        stamps = pd.to_datetime(picks_df[ts_column], utc=True, errors="coerce")
+        valid = stamps.notna()
+        seconds = stamps[valid].map(lambda t: t.timestamp()).to_numpy(dtype=float)
+        ends = np.searchsorted(np.asarray(self.times), seconds, side="right") - 1
+        teams = picks_df.loc[valid, "team"]
+        for end in np.unique(ends):
+            lines = {}
+            for key, fields in self._replay(int(end)).items():
+                away, _, home = key.partition(" @ ")
+                lines[away] = fields.get("spread_away")
+                lines[home] = fields.get("spread_home")
+            at = ends == end
+            spreads.loc[teams.index[at]] = teams[at].map(lines).astype(float).to_numpy()
+        return spreads
+
+    def moves(self, key, fields=None):
+        """Every recorded change for one game as (timestamp, field, old, new).
+
+        Keyframes repeat unchanged values, so only actual moves are reported.
+        """
+        state, out = {}, []
+        for record in self.records:
+            changed = record["games"].get(key, {})
+            for f, v in changed.items():
+                if fields and f not in fields:
+                    continue
+                if state.get(f) != v:
+                    out.append((record["ts"], f, state.get(f), v))
+                state[f] = v
+        return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect the recorded line movement for a week.")
+    ap.add_argument("--week", type=int, required=True, help="NFL week number")
+    ap.add_argument("--game", help='Matchup as "Away Team @ Home Team"')
+    ap.add_argument("--as-of", help='Show lines as of this time (e.g. "2025-12-06 18:00-05:00")')
+    args = ap.parse_args()
+
+    history = LineHistory(args.week)
+    if not len(history):
+        sys.exit(f"No line history at {history.path}")
+    print(f"{len(history)} snapshots from {history.records[0]['ts']} to {history.records[-1]['ts']}")
+
+    if args.as_of:
+        df = history.frame_as_of(args.as_of)
+        if args.game:
+            df = df[(df["away"] + " @ " + df["home"]) == args.game]
+        print(df.to_string(index=False))
+    elif args.game:
+        for ts, field, old, new in history.moves(args.game):
+            print(f"  {ts}  {field}: {old} -> {new}")
+    else:
+        for key in sorted(history.latest()):
+            print(f"  {key}: {len(history.moves(key, ['spread_home', 'total']))} spread/total moves")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Regrade the whole season in one process.
+
+Loads every week of lines and results (weeks 1-18 plus playoff rounds),
+grades all spread picks in a single vectorized pass against the spread each
+pick was made at, diffs against the `correct` values stored in Supabase and
+(with --apply) writes the grading columns of only the rows that changed.
+"""
+
+import sys
+import argparse
+import pandas as pd
+
+import season_store
+from grading import grade_ats, grade_locked_picks
+from results_script import lock_pick_spreads
+from supabase_integration import fetch_all_picks, update_pick_grades, grade_rows, PICK_COLUMNS, RESULT_TO_CORRECT
+from leaderboard_snapshot import publish_snapshot
+
+SEASON_WEEKS = list(range(1, 19)) + list(season_store.PLAYOFF_WEEKS.values())
+SCORE_COLUMNS = ["kickoff_et", "away", "home", "away_score", "home_score"]
+LINE_COLUMNS = ["away", "home", "spread_away", "spread_home", "total"]
+
+def load_season_csvs(weeks=SEASON_WEEKS):
+    """Scores and lines for every week from the CSVs (hand corrections preferred)."""
+    results, lines = [], []
+    for week in weeks:
+        results_csv = season_store.source_csv("results", week)
+        lines_csv = season_store.source_csv("lines", week)
+        if not results_csv or not lines_csv:
+            continue
+        week_results = pd.read_csv(results_csv)
+        if not set(SCORE_COLUMNS) <= set(week_results.columns):
+            print(f"Warning: {results_csv} has no score columns; skipping {season_store.week_label(week)}")
+            continue
+        results.append(week_results[SCORE_COLUMNS].assign(week=week))
+        lines.append(pd.read_csv(lines_csv)[LINE_COLUMNS].assign(week=week))
+    if not results:
+        return pd.DataFrame(columns=SCORE_COLUMNS + ["week"]), pd.DataFrame(columns=LINE_COLUMNS + ["week"])
+    return pd.concat(results, ignore_index=True), pd.concat(lines, ignore_index=True)
+
+def load_season_store(season=season_store.SEASON):
+    """Same as load_season_csvs but from the Parquet season store."""
+    results = season_store.load("results", columns=SCORE_COLUMNS, season=season)
+    lines = season_store.load("lines", columns=LINE_COLUMNS, season=season)
+    return results.dropna(subset=["away_score", "home_score"]), lines
+
+def regrade_picks(ats_df: pd.DataFrame, picks_df: pd.DataFrame) -> pd.DataFrame:
+    """Attach the regraded `correct` value to every gradable spread pick.
+
+    Each pick is graded against its stored spread; picks without one use the
+    line history at `created_at`, then the week's line. O/U picks (team
+    "O/U:...") and picks in weeks without results are left out.
+    """
+    spread_picks = picks_df[~picks_df["team"].astype(str).str.startswith("O/U:")]
+    if spread_picks.empty:
+        return spread_picks.assign(stored_correct=None, result=None)
+    locked = pd.concat([lock_pick_spreads(week_picks, int(week))
+                        for week, week_picks in spread_picks.groupby("week")])
+    graded = grade_locked_picks(ats_df, locked.rename(columns={"user_id": "user"}), keys=["week"], warn=False)
+    graded = (locked.rename(columns={"correct": "stored_correct", "spread": "locked_spread"})
+              .join(graded[["spread", "result"]], how="inner"))
+    graded["stored_spread"] = pd.to_numeric(spread_picks["spread"], errors="coerce")
+    graded["correct"] = graded["result"].map(RESULT_TO_CORRECT)
+    return graded
+
+def update_rows(changes: pd.DataFrame) -> list:
+    """Grading columns to write: `correct`, plus the spread locked from history where none was stored."""
+    spread = changes["locked_spread"].where(changes["stored_spread"].isna())
+    return grade_rows(changes[["id", "correct"]].assign(spread=spread))
+
+def changed_rows(graded: pd.DataFrame) -> pd.DataFrame:
+    """Picks whose regraded value differs from what Supabase holds."""
+    new, old = graded["correct"], graded["stored_correct"]
+    same = (new.isna() & old.isna()) | (new.astype(object) == old.astype(object))
+    return graded[~same]
+
+def main():
+    ap = argparse.ArgumentParser(description="Regrade every week of the season and sync changed picks to Supabase.")
+    ap.add_argument("--from-store", action="store_true",
+                    help="Load lines/results from the Parquet season store instead of the CSVs")
+    ap.add_argument("--apply", action="store_true",
+                    help="Write the changed picks to Supabase (default: only show what would change)")
+    args = ap.parse_args()
+
+    results_df, lines_df = load_season_store() if args.from_store else load_season_csvs()
+    if results_df.empty:
+        sys.exit("No results found to grade.")
+    print(f"Loaded {len(results_df)} games across {results_df['week'].nunique()} weeks")
+
+    ats_df = grade_ats(results_df, lines_df, keys=("week", "home", "away"))
+    print(f"Graded {len(ats_df)} games against the spread")
+
+    picks_df = fetch_all_picks(PICK_COLUMNS + ["created_at"])
+    if picks_df.empty:
+        sys.exit("No picks found in Supabase.")
+    graded = regrade_picks(ats_df, picks_df)
+    changes = changed_rows(graded)
+    print(f"Regraded {len(graded)} of {len(picks_df)} picks; {len(changes)} differ from Supabase")
+
+    if changes.empty:
+        return
+    for week, week_changes in changes.groupby("week"):
+        print(f"\n{season_store.week_label(int(week)).title()}:")
+        for _, pick in week_changes.iterrows():
+            print(f"  {pick['user_id']} - {pick['team']}: {pick['stored_correct']} -> {pick['correct']}")
+
+    if not args.apply:
+        print("\nDry run: no changes written (rerun with --apply to write them)")
+        return
+
+    outcomes = update_pick_grades(update_rows(changes))
+    failed = [o for o in outcomes if not o["ok"]]
+    print(f"\nUpdated {sum(o['rows'] for o in outcomes if o['ok'])} picks in {len(outcomes)} chunk(s)")
+    if failed:
+        sys.exit(f"{len(failed)} chunk(s) failed; rerun to retry (updates are idempotent)")
+    publish_snapshot()
+
+if __name__ == "__main__":
+    main()
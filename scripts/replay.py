@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Record-and-replay harness for the Odds API and OpenWeatherMap.
+
+  record  Run one of the scripts with every live response saved as a fixture.
+  serve   Replay fixtures from a local HTTP stand-in, with optional latency,
+          injected errors and Odds API style quota / rate-limit headers.
+  load    Hammer an endpoint (usually the stand-in) through the real fetch
+          functions and report latency percentiles.
+
+Point a script at the stand-in with --base-url (or ODDS_API_BASE_URL /
+OPENWEATHER_BASE_URL) to run the fetch layer or the whole pipeline offline.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import random
+import runpy
+import argparse
+import threading
+import statistics
+from urllib.parse import urlsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+
+import api_client
+from api_cache import cache_key, SECRET_PARAMS
+
+FIXTURE_DIR = "data/fixtures"
+# Response headers worth replaying (quota accounting and content type)
+KEPT_HEADERS = ("content-type", "x-requests-remaining", "x-requests-used", "x-requests-last")
+
+def fixture_path(fixture_dir, path, params):
+    """Fixtures are grouped by endpoint path and addressed like the response cache."""
+    slug = path.strip("/").replace("/", "_") or "root"
+    return os.path.join(fixture_dir, slug, f"{cache_key(path, params)}.json")
+
+class Recorder:
+    """api_client exchange hook that saves each successful response as a fixture."""
+
+    def __init__(self, fixture_dir=FIXTURE_DIR):
+        self.fixture_dir = fixture_dir
+        self.saved = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, params, response):
+        if not response.ok:
+            return
+        path = urlsplit(url).path
+        clean = {k: str(v) for k, v in (params or {}).items() if k not in SECRET_PARAMS}
+        fixture = {
+            "path": path,
+            "params": clean,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+            "body": response.json(),
+        }
+        target = fixture_path(self.fixture_dir, path, clean)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target + ".tmp", "w") as f:
+            json.dump(fixture, f)
+        os.replace(target + ".tmp", target)
+        with self._lock:
+            self.saved += 1
+
+class Fixtures:
+    """Fixtures indexed by exact request and by path (for requests that only differ in params)."""
+
+    def __init__(self, fixture_dir=FIXTURE_DIR):
+        self.fixture_dir = fixture_dir
+        self.by_key, self.by_path = {}, {}
+        for path in sorted(glob.glob(os.path.join(fixture_dir, "*", "*.json"))):
+            with open(path, "r") as f:
+                fixture = json.load(f)
+            self.by_key[cache_key(fixture["path"], fixture["params"])] = fixture
+            self.by_path.setdefault(fixture["path"], []).append(fixture)
+
+    def __len__(self):
+        return len(self.by_key)
+
+    def match(self, path, params, strict=False):
+        clean = {k: v for k, v in params.items() if k not in SECRET_PARAMS}
+        fixture = self.by_key.get(cache_key(path, clean))
+        if fixture is None and not strict and self.by_path.get(path):
+            fixture = self.by_path[path][-1]
+        return fixture
+
+class StandIn:
+    """Shared state for the stand-in server: fixtures, fault injection and quota counters."""
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 quota=500, rate_limit=0.0, strict=False, seed=None):
+        self.fixtures = fixtures
+        self.latency, self.jitter = latency, jitter
+        self.error_rate, self.error_status = error_rate, error_status
+        self.quota, self.used = quota, 0
+        self.rate_limit = rate_limit  # requests per second; 0 disables
+        self.strict = strict
+        self.random = random.Random(seed)
+        self.requests = 0
+        self._window = []
+        self._lock = threading.Lock()
+
+    def respond(self, path, params):
+        """(status, headers, body) for one request."""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            fail = self.random.random() < self.error_rate
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            limited = self.rate_limit and len(self._window) >= self.rate_limit
+            if not limited:
+                self._window.append(now)
+        time.sleep(delay)
+
+        if limited:
+            return 429, {"Retry-After": "1"}, {"message": "Rate limit exceeded (stand-in)"}
+        if fail:
+            return self.error_status, {}, {"message": "Injected error (stand-in)"}
+        fixture = self.fixtures.match(path, params, self.strict)
+        if fixture is None:
+            return 404, {}, {"message": f"No fixture for {path}"}
+        with self._lock:
+            self.used += 1
+            headers = {"x-requests-used": str(self.used),
+                       "x-requests-remaining": str(max(self.quota - self.used, 0)),
+                       "x-requests-last": "1"}
+        return fixture.get("status", 200), headers, fixture["body"]
+
+def make_handler(stand_in, quiet=False):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            status, headers, body = stand_in.respond(parts.path, dict(parse_qsl(parts.query)))
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, fmt, *args):
+            if not quiet:
+                super().log_message(fmt, *args)
+    return Handler
+
+def serve(stand_in, host="127.0.0.1", port=8765, quiet=False):
+    """Start the stand-in in a background thread; returns the server (call .shutdown() to stop)."""
+    server = ThreadingHTTPServer((host, port), make_handler(stand_in, quiet))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def record(script, script_args, fixture_dir=FIXTURE_DIR):
+    """Run scripts/<script> in this process with a Recorder attached to api_client."""
+    recorder = Recorder(fixture_dir)
+    api_client.add_exchange_hook(recorder)
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.path.basename(script))
+    sys.argv = [path] + list(script_args)
+    try:
+        runpy.run_path(path, run_name="__main__")
+    finally:
+        print(f"\nRecorded {recorder.saved} response(s) into {fixture_dir}")
+
+def load_test(endpoint, requests_total, concurrency, api_key="replay"):
+    """Call the real fetch function `requests_total` times; returns latencies and errors."""
+    # Every call must reach the server rather than the response cache
+    api_client.configure(refresh=True)
+    if endpoint == "odds":
+        from script import fetch_market
+        call = lambda: fetch_market(api_key, "spreads,totals,h2h", "2025-09-04T00:00:00Z", "2025-09-09T00:00:00Z")
+    elif endpoint == "scores":
+        from results_script import fetch_scores
+        call = lambda: fetch_scores(api_key, 3)
+    else:
+        from weather_script import WeatherAPI
+        weather = WeatherAPI(api_key)
+        call = lambda: weather.get_forecast("Green Bay", "WI", 44.5013, -88.0622)
+
+    def timed(_):
+        start = time.perf_counter()
+        try:
+            ok = call() is not None
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, range(requests_total)))
+    return [t for t, _ in results], sum(not ok for _, ok in results)
+
+def main():
+    ap = argparse.ArgumentParser(description="Record API fixtures, replay them from a local stand-in, or load-test it.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Run a script and save its live responses as fixtures")
+    rec.add_argument("--fixtures", default=FIXTURE_DIR)
+    rec.add_argument("script", help="Script in scripts/, e.g. script.py")
+    rec.add_argument("script_args", nargs=argparse.REMAINDER, help="Arguments for the script")
+
+    srv = sub.add_parser("serve", help="Serve fixtures on a local port")
+    srv.add_argument("--fixtures", default=FIXTURE_DIR)
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8765)
+    srv.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    srv.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- seconds around --latency")
+    srv.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    srv.add_argument("--error-status", type=int, default=503, help="Status code for injected failures")
+    srv.add_argument("--quota", type=int, default=500, help="Starting x-requests-remaining")
+    srv.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second before 429s (0 = off)")
+    srv.add_argument("--strict", action="store_true", help="Only serve exact request matches")
+    srv.add_argument("--seed", type=int, help="Seed for latency jitter and error injection")
+    srv.add_argument("--quiet", action="store_true", help="Don't log each request")
+
+    lt = sub.add_parser("load", help="Load-test an endpoint through the real fetch functions")
+    lt.add_argument("endpoint", choices=["odds", "scores", "forecast"])
+    lt.add_argument("--base-url", default="http://127.0.0.1:8765", help="Stand-in (or real) API root")
+    lt.add_argument("--requests", type=int, default=200)
+    lt.add_argument("--concurrency", type=int, default=8)
+    args = ap.parse_args()
+
+    if args.command == "record":
+        script_args = args.script_args[1:] if args.script_args[:1] == ["--"] else args.script_args
+        record(args.script, script_args, args.fixtures)
+        return
+
+    if args.command == "serve":
+        fixtures = Fixtures(args.fixtures)
+        if not len(fixtures):
+            sys.exit(f"No fixtures in {args.fixtures}; record some first (replay.py record ...)")
+        stand_in = StandIn(fixtures, args.latency, args.jitter, args.error_rate, args.error_status,
+                           args.quota, args.rate_limit, args.strict, args.seed)
+        server = serve(stand_in, args.host, args.port, args.quiet)
+        print(f"Serving {len(fixtures)} fixture(s) on http://{args.host}:{args.port} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+            print(f"\nServed {stand_in.requests} request(s)")
+        return
+
+    service = "openweathermap" if args.endpoint == "forecast" else "odds"
+    api_client.set_base_url(service, args.base_url)
+    start = time.perf_counter()
+    latencies, errors = load_test(args.endpoint, args.requests, args.concurrency)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{args.requests} {args.endpoint} requests, concurrency {args.concurrency}: "
+          f"{args.requests / elapsed:.1f} req/s, {errors} error(s)")
+    print(f"  p50 {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms, "
+          f"max {latencies[-1] * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
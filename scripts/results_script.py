@@ -1,5 +1,13 @@
 # nfl_week_results.py
 import os, sys, argparse, datetime as dt, pytz, requests, pandas as pd
+import api_client
+from api_client import get_json
+from api_cache import ENDPOINT_TTLS, OfflineCacheMiss
+from grading import grade_ats, grade_picks, grade_locked_picks
+from line_history import LineHistory
+from leaderboard_snapshot import publish_snapshot
+import season_store
+import telemetry
 from supabase_integration import extract_picks_for_week, save_picks_to_csv, update_pick_results, get_leaderboard
 
 SPORT = "americanfootball_nfl"
@@ -19,26 +27,29 @@ def week_window_from_weeknum(week1_start_et_str: str, week: int):
 
 def fetch_scores(api_key: str, days_from: int = 3):
     """Fetch completed game scores from The Odds API."""
-    url = f"https://api.the-odds-api.com/v4/sports/{SPORT}/scores"
+    url = f"{api_client.base_url('odds')}/v4/sports/{SPORT}/scores"
     params = {
         "apiKey": api_key,
         "daysFrom": days_from,
         "dateFormat": "iso"
     }
-    r = requests.get(url, params=params, timeout=25)
-    r.raise_for_status()
-    return r.json()
+    return get_json(url, params, ttl=ENDPOINT_TTLS["scores"])
 
-def parse_game_results(scores_data):
-    """Parse scores data into a structured DataFrame."""
+def parse_game_results(scores_data, include_live=False):
+    """Parse scores data into a structured DataFrame.
+    
+    With include_live, in-progress games that already have scores are kept
+    with completed=False; otherwise only completed games are returned.
+    """
     games = []
     tz = pytz.timezone("America/New_York")
     
     for game in scores_data:
-        if not game.get("completed", False):
+        completed = game.get("completed", False)
+        if not completed and not include_live:
             continue  # Skip incomplete games
             
-        scores = game.get("scores", [])
+        scores = game.get("scores") or []
         if len(scores) != 2:
             continue  # Need exactly 2 team scores
             
@@ -66,7 +77,7 @@ def parse_game_results(scores_data):
             "away": game["away_team"],
             "home_score": int(home_score),
             "away_score": int(away_score),
-            "completed": True
+            "completed": bool(completed)
         })
     
     return pd.DataFrame(games)
@@ -78,115 +89,47 @@ def calculate_ats_results(results_df, odds_csv):
         return None
     
     odds_df = pd.read_csv(odds_csv)
-    odds_df["kickoff_et"] = pd.to_datetime(odds_df["kickoff_et"])
+    return grade_ats(results_df, odds_df)
 
-    # Merge on team names and approximate kickoff time (within 1 hour)
-    merged_games = []
+def lock_pick_spreads(picks_df, week):
+    """Fill each pick's spread from the line history where it wasn't stored with the pick."""
+    picks_df = picks_df.copy()
+    if "spread" not in picks_df.columns:
+        picks_df["spread"] = None
+    picks_df["spread"] = pd.to_numeric(picks_df["spread"], errors="coerce")
+    missing = picks_df["spread"].isna()
+    if missing.any():
+        from_history = LineHistory(week).pick_spreads(picks_df[missing])
+        picks_df.loc[missing, "spread"] = from_history
+        still_missing = int(picks_df["spread"].isna().sum())
+        if still_missing:
+            print(f"Note: {still_missing} pick(s) have no locked line; grading those against the week's line")
+    return picks_df
 
-    for _, result in results_df.iterrows():
-        # Find matching game in odds data (match on teams only for simplicity)
-        matches = odds_df[
-            (odds_df["home"] == result["home"]) &
-            (odds_df["away"] == result["away"])
-        ]
-        
-        if matches.empty:
-            print(f"Warning: No odds found for {result['away']} @ {result['home']}")
-            continue
-            
-        odds = matches.iloc[0]
-        
-        # Calculate actual margin (positive = home win, negative = away win)
-        actual_margin = result["home_score"] - result["away_score"]
-        
-        # Get spreads (home spread should be negative for favorites)
-        home_spread = odds["spread_home"] if pd.notna(odds["spread_home"]) else 0
-        away_spread = odds["spread_away"] if pd.notna(odds["spread_away"]) else 0
-        
-        # Calculate ATS results
-        # Home team covers if: actual_margin + home_spread > 0
-        # Away team covers if: actual_margin + home_spread < 0
-        # Push if: actual_margin + home_spread == 0
-        
-        home_ats_margin = actual_margin + home_spread
-        away_ats_margin = -actual_margin + away_spread
-        
-        if home_ats_margin > 0:
-            home_ats_result = "W"
-            away_ats_result = "L"
-        elif home_ats_margin < 0:
-            home_ats_result = "L"
-            away_ats_result = "W"
-        else:
-            home_ats_result = "P"  # Push
-            away_ats_result = "P"
-        
-        merged_games.append({
-            "kickoff_et": result["kickoff_et"],
-            "away": result["away"],
-            "home": result["home"],
-            "away_score": result["away_score"],
-            "home_score": result["home_score"],
-            "actual_margin": actual_margin,
-            "home_spread": home_spread,
-            "away_spread": away_spread,
-            "home_ats_margin": home_ats_margin,
-            "home_ats_result": home_ats_result,
-            "away_ats_result": away_ats_result,
-            "total": odds["total"] if pd.notna(odds["total"]) else None,
-            "actual_total": result["home_score"] + result["away_score"],
-            "over_under": "Over" if pd.notna(odds["total"]) and (result["home_score"] + result["away_score"]) > odds["total"] 
-                         else "Under" if pd.notna(odds["total"]) and (result["home_score"] + result["away_score"]) < odds["total"]
-                         else "Push" if pd.notna(odds["total"]) else None
-        })
+def evaluate_picks(ats_results_df, picks_csv, grade_mode="line", week=None, picks_df=None, lines_df=None):
+    """Evaluate user picks against ATS results.
     
-    return pd.DataFrame(merged_games)
-
-def evaluate_picks(ats_results_df, picks_csv):
-    """Evaluate user picks against ATS results."""
-    if not os.path.exists(picks_csv):
-        print(f"Warning: Picks file {picks_csv} not found. Create this file with your picks.")
-        return None
+    grade_mode "line" grades every pick against the week's lines CSV;
+    "locked" grades each pick against the spread it was made at. With the
+    week's lines_df, picks carrying a game_id are matched to their game by
+    event id instead of by team name.
+    """
+    if picks_df is None:
+        if not os.path.exists(picks_csv):
+            print(f"Warning: Picks file {picks_csv} not found. Create this file with your picks.")
+            return None
+        picks_df = pd.read_csv(picks_csv)
     
-    picks_df = pd.read_csv(picks_csv)
+    if grade_mode == "locked":
+        spread_picks = picks_df[~picks_df["team"].astype(str).str.startswith("O/U:")]
+        return grade_locked_picks(ats_results_df, lock_pick_spreads(spread_picks, week), lines_df=lines_df)
     
     # Expected picks format:
-    # user,team,game_date
+    # user,team,game_date[,game_id]
     # John,Bills,2024-09-08
     # John,Chiefs,2024-09-09
     
-    user_results = []
-    
-    for _, pick in picks_df.iterrows():
-        user = pick["user"]
-        team = pick["team"]
-        
-        # Find the game result for this team
-        team_games = ats_results_df[
-            (ats_results_df["home"] == team) | (ats_results_df["away"] == team)
-        ]
-        
-        if team_games.empty:
-            print(f"Warning: No result found for {user}'s pick: {team}")
-            continue
-        
-        game = team_games.iloc[0]
-        
-        # Determine if this team covered the spread
-        if game["home"] == team:
-            ats_result = game["home_ats_result"]
-        else:
-            ats_result = game["away_ats_result"]
-        
-        user_results.append({
-            "user": user,
-            "team": team,
-            "opponent": game["away"] if game["home"] == team else game["home"],
-            "result": ats_result,
-            "game_date": game["kickoff_et"].strftime("%Y-%m-%d")
-        })
-    
-    return pd.DataFrame(user_results)
+    return grade_picks(ats_results_df, picks_df, lines_df=lines_df)
 
 def main():
     ap = argparse.ArgumentParser(description="Fetch NFL game results and evaluate ATS picks.")
@@ -208,12 +151,33 @@ def main():
                     help="Output path for results CSV (if not specified, uses nfl_results_week{N}.csv)")
     ap.add_argument("--days-from", type=int, default=3,
                     help="Number of past days to fetch completed games (1-3)")
+    ap.add_argument("--offline", action="store_true",
+                    help="Serve scores strictly from the local API cache (no network calls).")
+    ap.add_argument("--refresh", action="store_true",
+                    help="Ignore cached scores and refetch (new responses are still cached).")
+    ap.add_argument("--grade-mode", choices=["line", "locked"], default="line",
+                    help="Grade picks against the week's lines CSV (line) or the spread each pick "
+                         "was made at, from the pick or the line history (locked)")
+    ap.add_argument("--base-url",
+                    help="Odds API root, e.g. a local stand-in (or set ODDS_API_BASE_URL).")
+    ap.add_argument("--report",
+                    help="Run report JSON path (default: data/cache/reports/results_script.json)")
+    ap.add_argument("--prom-textfile",
+                    help="Also write the run's metrics here for the node exporter textfile collector")
     
     args = ap.parse_args()
     
-    if not args.api_key:
+    if not args.api_key and not args.offline:
         sys.exit("Missing API key. Use --api-key or set ODDS_API_KEY.")
+    api_client.configure(offline=args.offline, refresh=args.refresh)
+    if args.base_url:
+        api_client.set_base_url("odds", args.base_url)
     
+    with telemetry.run_report("results_script", args.report, args.prom_textfile) as run:
+        grade_week(args, run)
+
+def grade_week(args, run):
+    """Fetch scores, grade the week and sync pick results, timing each stage on `run`."""
     # Auto-generate filenames if not provided
     if not args.odds_csv:
         args.odds_csv = f"data/lines/nfl_lines_week{args.week}.csv"
@@ -224,11 +188,16 @@ def main():
     print(f"Using odds file: {args.odds_csv}")
     
     # Handle picks: either from Supabase or CSV file
+    supabase_picks = None
     if args.use_supabase and not args.picks_csv:
         print("Extracting picks from Supabase...")
-        picks_df = extract_picks_for_week(args.week)
+        with run.span("extract_picks") as span:
+            picks_df = extract_picks_for_week(args.week)
+            span.rows = len(picks_df)
         if not picks_df.empty:
             args.picks_csv = save_picks_to_csv(picks_df, args.week)
+            # The CSV drops each pick's stored spread and timestamp, which locked grading needs
+            supabase_picks = picks_df.rename(columns={"user_id": "user"})
             print(f"Picks extracted to: {args.picks_csv}")
         else:
             print("No picks found in Supabase for this week")
@@ -239,8 +208,13 @@ def main():
     print(f"Using picks file: {args.picks_csv}")
     
     # Fetch game scores
-    scores_data = fetch_scores(args.api_key, args.days_from)
-    results_df = parse_game_results(scores_data)
+    with run.span("fetch_scores") as span:
+        try:
+            scores_data = fetch_scores(args.api_key, args.days_from)
+        except OfflineCacheMiss as e:
+            sys.exit(f"Offline mode: {e}")
+        results_df = parse_game_results(scores_data)
+        span.rows = len(results_df)
     
     if results_df.empty:
         print("No completed games found in the specified time window.")
@@ -249,7 +223,9 @@ def main():
     print(f"Found {len(results_df)} completed games")
     
     # Calculate ATS results
-    ats_results = calculate_ats_results(results_df, args.odds_csv)
+    with run.span("grade_ats") as span:
+        ats_results = calculate_ats_results(results_df, args.odds_csv)
+        span.rows = 0 if ats_results is None else len(ats_results)
     
     if ats_results is None or ats_results.empty:
         print("Could not calculate ATS results.")
@@ -266,12 +242,18 @@ def main():
         print()
     
     # Save results
-    ats_results.to_csv(args.results_csv, index=False)
-    print(f"Results saved to: {args.results_csv}")
+    with run.span("save_results", rows=len(ats_results)):
+        ats_results.to_csv(args.results_csv, index=False)
+        print(f"Results saved to: {args.results_csv}")
+        season_store.write_week("results", args.week, ats_results)
     
     # Evaluate picks if provided
     if args.picks_csv:
-        user_results = evaluate_picks(ats_results, args.picks_csv)
+        with run.span("evaluate_picks") as span:
+            user_results = evaluate_picks(ats_results, args.picks_csv, args.grade_mode, args.week,
+                                          supabase_picks if args.grade_mode == "locked" else None,
+                                          pd.read_csv(args.odds_csv))
+            span.rows = 0 if user_results is None else len(user_results)
         if user_results is not None:
             print("\n=== PICK RESULTS ===")
             for user in user_results["user"].unique():
@@ -285,25 +267,35 @@ def main():
                     print(f"  {pick['team']} vs {pick['opponent']}: {pick['result']}")
             
             # Save pick results
-            picks_results_csv = f"data/pick_results/pick_results_week{args.week}.csv"
-            user_results.to_csv(picks_results_csv, index=False)
-            print(f"Pick results saved to: {picks_results_csv}")
+            with run.span("save_pick_results", rows=len(user_results)):
+                picks_results_csv = f"data/pick_results/pick_results_week{args.week}.csv"
+                user_results.to_csv(picks_results_csv, index=False)
+                print(f"Pick results saved to: {picks_results_csv}")
+                season_store.write_week("pick_results", args.week, user_results)
             
             # Update Supabase with results if enabled
             if args.update_supabase:
                 print("\nUpdating Supabase with pick results...")
-                if update_pick_results(args.week, user_results):
+                with run.span("update_supabase", rows=len(user_results)) as span:
+                    updated = update_pick_results(args.week, user_results)
+                    span.status = "ok" if updated else "failed"
+                if updated:
                     print("✓ Supabase updated successfully")
+                    with run.span("leaderboard_snapshot"):
+                        publish_snapshot()
                     
                     # Show updated leaderboard
                     print("\n=== UPDATED LEADERBOARD ===")
-                    leaderboard = get_leaderboard()
+                    with run.span("leaderboard") as span:
+                        leaderboard = get_leaderboard()
+                        span.rows = len(leaderboard)
                     if not leaderboard.empty:
                         for _, row in leaderboard.iterrows():
                             print(f"{row['user']}: {row['correct_picks']}/{row['total_picks']} ({row['percentage']}%)")
                     else:
                         print("Could not retrieve leaderboard")
                 else:
+                    run.status = "error"
                     print("✗ Failed to update Supabase")
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Incremental score poller.
+
+Polls the scores endpoint on a schedule while games are in progress, grades
+only games that have finished since the last poll, and pushes just those
+picks' results to Supabase so the leaderboard updates within minutes. With
+--live it also publishes a small snapshot of in-progress scores and each pick's
+current cover status to the Supabase `snapshots` table, which the app polls.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import datetime as dt
+import pandas as pd
+
+import api_client
+from results_script import fetch_scores, parse_game_results
+from grading import grade_ats, grade_picks, live_cover_status
+from supabase_integration import extract_picks_for_week, update_pick_results, store_snapshot
+from leaderboard_snapshot import publish_snapshot
+
+GAME_WINDOW = dt.timedelta(hours=4, minutes=30)  # kickoff until a final score is likely
+ACTIVE_INTERVAL = 5 * 60
+IDLE_INTERVAL = 30 * 60
+LIVE_SNAPSHOT = "live_week{week}"  # snapshots row the app polls during games
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {"graded": []}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+def append_rows(csv_path, new_rows, keys):
+    """Merge new rows into a week CSV, replacing any earlier row with the same keys."""
+    if os.path.exists(csv_path):
+        existing = pd.read_csv(csv_path)
+        new_rows = pd.concat([existing, new_rows], ignore_index=True)
+    merged = new_rows.drop_duplicates(subset=keys, keep="last")
+    os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+    merged.to_csv(csv_path, index=False)
+
+def kickoffs(lines_df):
+    return pd.to_datetime(lines_df["kickoff_et"], utc=True)
+
+def in_game_window(lines_df, now):
+    """True if any game has kicked off and could still be finishing."""
+    k = kickoffs(lines_df)
+    return bool(((k <= now) & (now <= k + GAME_WINDOW)).any())
+
+def sleep_seconds(lines_df, now, interval, idle_interval):
+    """Seconds until the next poll: `interval` during games, else idle but no later than the next kickoff."""
+    if in_game_window(lines_df, now):
+        return interval
+    upcoming = kickoffs(lines_df)[lambda k: k > now]
+    if upcoming.empty:
+        return idle_interval
+    return max(1, min(idle_interval, int((upcoming.min() - now).total_seconds()) + 1))
+
+def build_live_snapshot(week, games_df, picks_df):
+    """In-progress scores and each pick's current cover status, as the app reads them."""
+    status = live_cover_status(games_df, picks_df) if not picks_df.empty else pd.DataFrame()
+    games = games_df.assign(kickoff_et=games_df["kickoff_et"].map(lambda k: k.isoformat()))
+    games = games[["game_id", "kickoff_et", "away", "home", "away_score", "home_score", "completed"]]
+    return {
+        "week": week,
+        "games": games.astype(object).where(games.notna(), None).to_dict("records"),
+        "picks": status.astype(object).where(status.notna(), None).to_dict("records"),
+    }
+
+def publish_live_snapshot(week, games_df, picks_df, dry_run=False):
+    snapshot = build_live_snapshot(week, games_df, picks_df)
+    if dry_run:
+        print(f"  Dry run: would publish live snapshot ({len(snapshot['games'])} games, "
+              f"{len(snapshot['picks'])} picks)")
+        return
+    try:
+        store_snapshot(LIVE_SNAPSHOT.format(week=week), snapshot)
+    except Exception as e:
+        # Live status is best effort; grading carries on without it
+        print(f"Could not publish live snapshot: {e}")
+
+def poll_once(args, lines_df, state):
+    """Grade any newly completed games; returns the number of games graded."""
+    results_df = parse_game_results(fetch_scores(args.api_key, args.days_from), include_live=args.live)
+    if results_df.empty:
+        return 0
+    picks_df = None
+    if args.live:
+        picks_df = extract_picks_for_week(args.week).rename(columns={"user_id": "user"})
+        publish_live_snapshot(args.week, results_df, picks_df, args.dry_run)
+
+    completed = results_df[results_df["completed"]]
+    new_games = completed[~completed["game_id"].isin(state["graded"])]
+    ats = grade_ats(new_games, lines_df, warn=False) if not new_games.empty else pd.DataFrame()
+    if ats.empty:
+        return 0
+
+    print(f"[{dt.datetime.now():%H:%M}] {len(ats)} newly final:")
+    for _, game in ats.iterrows():
+        print(f"  {game['away']} {game['away_score']} @ {game['home']} {game['home_score']}: "
+              f"{game['home']} {game['home_ats_result']}")
+    append_rows(args.results_csv, ats, ["home", "away"])
+
+    if picks_df is None:
+        picks_df = extract_picks_for_week(args.week).rename(columns={"user_id": "user"})
+    if not picks_df.empty:
+        # Only picks on the newly graded games resolve against this index
+        pick_results = grade_picks(ats, picks_df, warn=False, lines_df=lines_df)
+        if not pick_results.empty:
+            append_rows(args.pick_results_csv, pick_results, ["user", "team"])
+            if args.dry_run:
+                print(f"  Dry run: would update {len(pick_results)} picks")
+            elif not update_pick_results(args.week, pick_results):
+                # Leave these games ungraded so the next poll retries them
+                return 0
+            else:
+                publish_snapshot()
+
+    if "game_id" in ats.columns:
+        matched = ats["game_id"]
+    else:
+        matched = new_games.merge(ats[["home", "away"]], on=["home", "away"])["game_id"]
+    state["graded"] = sorted(set(state["graded"]) | set(matched))
+    save_state(args.state, state)
+    return len(ats)
+
+def main():
+    ap = argparse.ArgumentParser(description="Poll scores during game windows and grade games as they finish.")
+    ap.add_argument("--api-key", default=os.getenv("ODDS_API_KEY"),
+                    help="The Odds API key (or set ODDS_API_KEY).")
+    ap.add_argument("--week", type=int, required=True, help="NFL week number being played")
+    ap.add_argument("--odds-csv", help="Lines CSV (default: data/lines/nfl_lines_week{N}.csv)")
+    ap.add_argument("--results-csv", help="Results CSV to append to (default: data/results/nfl_results_week{N}.csv)")
+    ap.add_argument("--state", help="Graded game ids (default: data/cache/poller_week{N}.json)")
+    ap.add_argument("--base-url", help="Odds API root, e.g. a local stand-in (or set ODDS_API_BASE_URL).")
+    ap.add_argument("--days-from", type=int, default=1,
+                    help="Number of past days of scores to request (1-3)")
+    ap.add_argument("--interval", type=int, default=ACTIVE_INTERVAL,
+                    help="Seconds between polls while games are in progress")
+    ap.add_argument("--idle-interval", type=int, default=IDLE_INTERVAL,
+                    help="Seconds between checks outside game windows")
+    ap.add_argument("--once", action="store_true", help="Poll a single time and exit")
+    ap.add_argument("--dry-run", action="store_true", help="Grade and write CSVs but do not update Supabase")
+    ap.add_argument("--live", action="store_true",
+                    help="Also publish in-progress scores and pick cover status to Supabase each poll")
+    args = ap.parse_args()
+
+    if not args.api_key:
+        sys.exit("Missing API key. Use --api-key or set ODDS_API_KEY.")
+    args.odds_csv = args.odds_csv or f"data/lines/nfl_lines_week{args.week}.csv"
+    args.results_csv = args.results_csv or f"data/results/nfl_results_week{args.week}.csv"
+    args.pick_results_csv = f"data/pick_results/pick_results_week{args.week}.csv"
+    args.state = args.state or f"data/cache/poller_week{args.week}.json"
+
+    if not os.path.exists(args.odds_csv):
+        sys.exit(f"Error: Odds file {args.odds_csv} not found")
+    lines_df = pd.read_csv(args.odds_csv)
+    # Every poll must see fresh scores; responses are still cached for --offline reruns
+    api_client.configure(refresh=True)
+    if args.base_url:
+        api_client.set_base_url("odds", args.base_url)
+    state = load_state(args.state)
+
+    total_games = len(lines_df)
+    while True:
+        now = pd.Timestamp.now(tz="UTC")
+        # Past the last window we still poll once to sweep up late finishes
+        past_last_game = kickoffs(lines_df).max() + GAME_WINDOW < now
+        if args.once or past_last_game or in_game_window(lines_df, now):
+            try:
+                poll_once(args, lines_df, state)
+            except Exception as e:
+                print(f"Poll failed: {e}")
+        if len(state["graded"]) >= total_games:
+            print(f"All {total_games} games graded for week {args.week}")
+            break
+        if args.once or past_last_game:
+            break
+        # Decide on a fresh clock: a poll can straddle a kickoff
+        time.sleep(sleep_seconds(lines_df, pd.Timestamp.now(tz="UTC"), args.interval, args.idle_interval))
+
+if __name__ == "__main__":
+    main()
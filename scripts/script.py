@@ -1,5 +1,12 @@
 # nfl_week_lines.py
 import os, sys, argparse, datetime as dt, pytz, requests, pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+import api_client
+from api_client import get_json
+from api_cache import ENDPOINT_TTLS, OfflineCacheMiss
+import season_store
+import telemetry
+from line_history import LineHistory
 
 SPORT = "americanfootball_nfl"
 REGION = "us"                      # US books
@@ -28,7 +35,7 @@ def week_window_from_weeknum(week1_start_et_str: str, week: int):
     return start, end
 
 def fetch_market(api_key: str, market: str, t_from_iso: str, t_to_iso: str):
-    url = f"https://api.the-odds-api.com/v4/sports/{SPORT}/odds"
+    url = f"{api_client.base_url('odds')}/v4/sports/{SPORT}/odds"
     params = {
         "regions": REGION,
         "markets": market,
@@ -37,9 +44,43 @@ def fetch_market(api_key: str, market: str, t_from_iso: str, t_to_iso: str):
         "commenceTimeFrom": t_from_iso,
         "commenceTimeTo": t_to_iso,
     }
-    r = requests.get(url, params=params, timeout=25)
-    r.raise_for_status()
-    return r.json()
+    return get_json(url, params, ttl=ENDPOINT_TTLS["odds"])
+
+def split_markets(events, markets=MARKETS):
+    """Split a combined-markets response into one event list per market.
+
+    Each bookmaker is kept only for the markets it actually quotes, so
+    pick_book sees the same candidates it would from a single-market request.
+    """
+    split = {m: [] for m in markets}
+    for g in events:
+        for m in markets:
+            books = []
+            for b in g.get("bookmakers", []):
+                ms = [x for x in b.get("markets", []) if x["key"] == m]
+                if ms:
+                    books.append({**b, "markets": ms})
+            split[m].append({**g, "bookmakers": books})
+    return split
+
+def fetch_markets(api_key: str, t_from_iso: str, t_to_iso: str, markets=MARKETS, combined: bool = True):
+    """Fetch every market for the window, returning {market: events}.
+
+    By default this is a single request with `markets=spreads,totals,h2h`;
+    with combined=False (or if the combined request fails) the markets are
+    requested in parallel over the shared session instead.
+    """
+    if combined:
+        try:
+            events = fetch_market(api_key, ",".join(markets), t_from_iso, t_to_iso)
+            return split_markets(events, markets)
+        except OfflineCacheMiss:
+            print("No cached combined response; trying cached per-market responses")
+        except requests.exceptions.RequestException as e:
+            print(f"Combined markets request failed ({e}); fetching markets separately")
+    with ThreadPoolExecutor(max_workers=len(markets)) as pool:
+        futures = {m: pool.submit(fetch_market, api_key, m, t_from_iso, t_to_iso) for m in markets}
+        return {m: f.result() for m, f in futures.items()}
 
 def pick_book(books, preferred=PREFERRED_BOOKS):
     by_name = {b["title"]: b for b in books}
@@ -88,7 +129,86 @@ def index_market(events, kind):
             })
     return rows
 
-def build_frame(spreads, totals, money):
+# (market, column) -> outcome name side; "home"/"away" resolve per game
+BOOK_FIELDS = {
+    "spreads": {"spread_home": ("home", "point"), "spread_home_price": ("home", "price"),
+                "spread_away": ("away", "point"), "spread_away_price": ("away", "price")},
+    "totals": {"total": ("Over", "point"), "over_price": ("Over", "price"), "under_price": ("Under", "price")},
+    "h2h": {"ml_home": ("home", "price"), "ml_away": ("away", "price")},
+}
+# Best quote per side: price column -> (point column, whether a higher point is better).
+# A better point beats any price at a worse one; within the best point, American
+# odds are better the higher they are, for favorites and dogs alike.
+BEST_PRICES = {"spreads": {"spread_home_price": ("spread_home", True), "spread_away_price": ("spread_away", True)},
+               "totals": {"over_price": ("total", False), "under_price": ("total", True)},
+               "h2h": {"ml_home": (None, None), "ml_away": (None, None)}}
+
+def book_rows(events, kind):
+    """Every bookmaker's quote for one market as a long frame (one row per game and book)."""
+    rows = []
+    for g in events:
+        names = {"home": g["home_team"], "away": g["away_team"]}
+        for b in g.get("bookmakers", []):
+            market = next((m for m in b.get("markets", []) if m["key"]==kind), None)
+            if not market:
+                continue
+            outcomes = {o["name"]: o for o in market["outcomes"]}
+            row = {"game_id": g["id"], "book": b["title"]}
+            for col, (side, field) in BOOK_FIELDS[kind].items():
+                row[col] = outcomes.get(names.get(side, side), {}).get(field)
+            rows.append(row)
+    return pd.DataFrame(rows, columns=["game_id", "book"] + list(BOOK_FIELDS[kind]))
+
+def consensus(spreads, totals, money):
+    """Consensus lines, best prices and book disagreement per game across all books.
+
+    Returns one row per game_id with the median spread/total, the spread and
+    total ranges (max - min across books), the number of books quoting each
+    market, and the best quote for every side: the most favourable point
+    (best_*_point), the best price at that point and the book offering it.
+    """
+    frames = []
+    for kind, events in (("spreads", spreads), ("totals", totals), ("h2h", money)):
+        books = book_rows(events, kind)
+        if books.empty:
+            continue
+        for col in BOOK_FIELDS[kind]:
+            books[col] = pd.to_numeric(books[col], errors="coerce")
+        grouped = books.groupby("game_id")
+        out = pd.DataFrame({f"{kind}_books": grouped["book"].nunique()})
+        point = {"spreads": "spread_home", "totals": "total"}.get(kind)
+        if point:
+            out[f"consensus_{point}"] = grouped[point].median()
+            out[f"{point}_range"] = grouped[point].max() - grouped[point].min()
+        for col, (point_col, higher) in BEST_PRICES[kind].items():
+            quotes = books.loc[books[col].notna()]
+            if point_col:
+                quotes = quotes.loc[quotes[point_col].notna()]
+                best = quotes.sort_values([point_col, col], ascending=[not higher, False], kind="stable")
+            else:
+                best = quotes.sort_values(col, ascending=False, kind="stable")
+            best = best.drop_duplicates("game_id").set_index("game_id")
+            if point_col:
+                out[f"best_{col}_point"] = best[point_col]
+            out[f"best_{col}"] = best[col]
+            out[f"best_{col}_book"] = best["book"]
+        frames.append(out)
+    if not frames:
+        return pd.DataFrame()
+    out = pd.concat(frames, axis=1)
+    if "consensus_spread_home" in out:
+        out.insert(out.columns.get_loc("consensus_spread_home"), "consensus_spread_away", -out["consensus_spread_home"])
+    return out.reset_index()
+
+def build_frame(spreads, totals, money, all_books=False):
+    """One row per game with the preferred book's lines.
+
+    game_id is the Odds API event id, which the scores feed also carries, so
+    results join back to these lines without relying on team names.
+
+    With all_books, consensus/best-price columns from every bookmaker in the
+    response are appended after the single-book columns.
+    """
     ix = {}
     for d in (index_market(spreads,"spreads"),
               index_market(totals,"totals"),
@@ -103,10 +223,16 @@ def build_frame(spreads, totals, money):
             "spread_away","spread_away_price","spread_home","spread_home_price",
             "total","over_price","under_price",
             "ml_away","ml_home",
-            "spreads_book","totals_book","h2h_book"]
+            "spreads_book","totals_book","h2h_book",
+            "game_id"]
     for c in cols:
         if c not in df.columns:
             df[c] = None
+    if all_books:
+        agg = consensus(spreads, totals, money)
+        if not agg.empty:
+            df = df.merge(agg, on="game_id", how="left")
+            cols += [c for c in agg.columns if c != "game_id"]
     return df[cols].sort_values("kickoff_et").reset_index(drop=True)
 
 def main():
@@ -120,10 +246,25 @@ def main():
     ap.add_argument("--week", type=int, help="NFL week number (1..postseason as you define)")
     ap.add_argument("--days", type=int, default=7, help="Length of window in days (default 7).")
     ap.add_argument("--csv", help="Output CSV path (if not specified, uses nfl_lines_week{N}.csv format).")
+    ap.add_argument("--per-market", action="store_true",
+                    help="Request each market separately (in parallel) instead of one combined request.")
+    ap.add_argument("--all-books", action="store_true",
+                    help="Add consensus (median) lines, best prices and book disagreement across every book.")
+    ap.add_argument("--offline", action="store_true",
+                    help="Serve responses strictly from the local API cache (no network calls).")
+    ap.add_argument("--refresh", action="store_true",
+                    help="Ignore cached responses and refetch (new responses are still cached).")
+    ap.add_argument("--base-url", help="Odds API root, e.g. a local stand-in (or set ODDS_API_BASE_URL).")
+    ap.add_argument("--report", help="Run report JSON path (default: data/cache/reports/script.json)")
+    ap.add_argument("--prom-textfile",
+                    help="Also write the run's metrics here for the node exporter textfile collector")
     args = ap.parse_args()
 
-    if not args.api_key:
+    if not args.api_key and not args.offline:
         sys.exit("Missing API key. Use --api-key or set ODDS_API_KEY.")
+    api_client.configure(offline=args.offline, refresh=args.refresh)
+    if args.base_url:
+        api_client.set_base_url("odds", args.base_url)
 
     tz = pytz.timezone("America/New_York")
     if args.start_et:
@@ -143,21 +284,43 @@ def main():
         else:
             args.csv = "data/lines/nfl_lines_week.csv"
 
+    with telemetry.run_report("script", args.report, args.prom_textfile) as run:
+        fetch_week(args, start, end, week_num, run)
+
+def fetch_week(args, start, end, week_num, run):
+    """Fetch, build and save one week's lines, timing each stage on `run`."""
     t_from = iso_z(start)
     t_to   = iso_z(end)
 
-    # fetch each market within the window
-    spreads = fetch_market(args.api_key, "spreads", t_from, t_to)
-    totals  = fetch_market(args.api_key, "totals",  t_from, t_to)
-    money   = fetch_market(args.api_key, "h2h",     t_from, t_to)
+    # fetch all markets within the window
+    with run.span("fetch_markets") as span:
+        try:
+            markets = fetch_markets(args.api_key, t_from, t_to, combined=not args.per_market)
+        except OfflineCacheMiss as e:
+            sys.exit(f"Offline mode: {e}")
+        span.rows = len(markets["spreads"])
+    quota = api_client.quota_summary()
+    if quota:
+        print(f"Odds API quota: {quota['remaining']} remaining, {quota['used']} used")
 
-    df = build_frame(spreads, totals, money)
+    with run.span("build_frame") as span:
+        df = build_frame(markets["spreads"], markets["totals"], markets["h2h"], all_books=args.all_books)
+        span.rows = len(df)
     if df.empty:
         print("No games/odds in that window.")
         return
     print(df.to_string(index=False))
-    df.to_csv(args.csv, index=False)
-    print(f"\nSaved: {args.csv}")
+    with run.span("save_lines", rows=len(df)):
+        df.to_csv(args.csv, index=False)
+        print(f"\nSaved: {args.csv}")
+        if week_num:
+            stored = season_store.write_week("lines", week_num, df)
+            if stored:
+                print(f"Stored: {stored}")
+            # Every fetch is kept, so later moves never overwrite earlier lines
+            history = LineHistory(week_num)
+            moved = history.append(df)
+            print(f"Line history: {moved} game(s) moved ({len(history)} snapshots in {history.path})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
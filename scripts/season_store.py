@@ -0,0 +1,158 @@
+# season_store.py
+import os, re, sys, glob, argparse
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine for pandas)
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+SEASON = 2025
+STORE_DIR = "data/store"
+ET = "America/New_York"
+
+# Playoff rounds use the same week numbers as the frontend
+PLAYOFF_WEEKS = {"wildcard": 100, "divisional": 101, "conference": 102, "superbowl": 103}
+KINDS = ("lines", "results", "pick_results")
+
+# CSV sources per kind; {w} is a regular week number, {r} a playoff round
+CSV_SOURCES = {
+    "lines": ["data/lines/nfl_lines_week{w}.csv", "data/lines/nfl_playoff_{r}.csv"],
+    "results": ["data/results/nfl_results_week{w}.csv", "data/results/nfl_playoff_{r}_results.csv"],
+    "pick_results": ["data/pick_results/pick_results_week{w}.csv", "data/pick_results/pick_results_{r}.csv"],
+}
+# Hand-made corrections supersede the original file when present
+CORRECTION_SUFFIXES = ("_corrected", "_updated")
+
+FLOAT_COLUMNS = ("spread_away", "spread_away_price", "spread_home", "spread_home_price",
+                 "total", "over_price", "under_price", "ml_away", "ml_home",
+                 "home_spread", "away_spread", "home_ats_margin", "spread")
+INT_COLUMNS = ("away_score", "home_score", "actual_margin", "actual_total")
+
+_warned = False
+
+def _arrow_available() -> bool:
+    global _warned
+    if not HAVE_ARROW and not _warned:
+        print("Note: pyarrow not installed; skipping season store write (pip install pyarrow)")
+        _warned = True
+    return HAVE_ARROW
+
+def week_label(week: int) -> str:
+    for name, number in PLAYOFF_WEEKS.items():
+        if number == week:
+            return name
+    return f"week {week}"
+
+def partition_path(kind: str, week: int, season: int = SEASON, store_dir: str = STORE_DIR) -> str:
+    return os.path.join(store_dir, f"season={season}", f"kind={kind}", f"week={week}", "part.parquet")
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Give known columns stable types so partitions concatenate cleanly."""
+    df = df.copy()
+    if "kickoff_et" in df.columns:
+        df["kickoff_et"] = pd.to_datetime(df["kickoff_et"], utc=True).dt.tz_convert(ET)
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    for col in INT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].astype("string")
+    return df
+
+def write_week(kind: str, week: int, df: pd.DataFrame, season: int = SEASON, store_dir: str = STORE_DIR):
+    """Write one week's frame as a Parquet partition, replacing any previous one."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind {kind!r}; expected one of {KINDS}")
+    if df is None or df.empty or not _arrow_available():
+        return None
+    path = partition_path(kind, week, season, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    normalize(df).to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+def stored_weeks(kind: str, season: int = SEASON, store_dir: str = STORE_DIR):
+    pattern = os.path.join(store_dir, f"season={season}", f"kind={kind}", "week=*", "part.parquet")
+    weeks = [int(re.search(r"week=(\d+)", p).group(1)) for p in glob.glob(pattern)]
+    return sorted(weeks)
+
+def load(kind: str, weeks=None, columns=None, season: int = SEASON, store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """Load one week (int), several (iterable/range) or the whole season (None).
+
+    `columns` projects at read time so only those columns are decoded; a
+    `week` column is always added from the partition key.
+    """
+    if weeks is None:
+        weeks = stored_weeks(kind, season, store_dir)
+    elif isinstance(weeks, int):
+        weeks = [weeks]
+    frames = []
+    for week in weeks:
+        path = partition_path(kind, week, season, store_dir)
+        if not os.path.exists(path):
+            continue
+        df = pd.read_parquet(path, columns=[c for c in columns if c != "week"] if columns else None)
+        df.insert(0, "week", week)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["week"] + [c for c in (columns or []) if c != "week"])
+    return pd.concat(frames, ignore_index=True)
+
+def source_csv(kind: str, week: int):
+    """Path of the CSV that holds `kind` for `week`, preferring hand corrections."""
+    templates = CSV_SOURCES[kind]
+    round_name = week_label(week)
+    base = templates[1].format(r=round_name) if week in PLAYOFF_WEEKS.values() else templates[0].format(w=week)
+    stem, ext = os.path.splitext(base)
+    for suffix in CORRECTION_SUFFIXES:
+        if os.path.exists(stem + suffix + ext):
+            return stem + suffix + ext
+    return base if os.path.exists(base) else None
+
+def import_csvs(season: int = SEASON, kinds=KINDS, store_dir: str = STORE_DIR):
+    """Load every existing weekly CSV into the store; returns {kind: [weeks]}."""
+    imported = {}
+    weeks = list(range(1, 19)) + list(PLAYOFF_WEEKS.values())
+    for kind in kinds:
+        for week in weeks:
+            path = source_csv(kind, week)
+            if path is None:
+                continue
+            if write_week(kind, week, pd.read_csv(path), season, store_dir):
+                imported.setdefault(kind, []).append(week)
+    return imported
+
+def main():
+    ap = argparse.ArgumentParser(description="Columnar (Parquet) season store for lines, results and pick results.")
+    ap.add_argument("action", choices=["import", "show"], help="import existing CSVs, or show a stored slice")
+    ap.add_argument("--season", type=int, default=SEASON)
+    ap.add_argument("--kind", choices=KINDS, default="results")
+    ap.add_argument("--weeks", help='Week or range to show, e.g. "5" or "1-18"')
+    ap.add_argument("--columns", help="Comma-separated columns to load")
+    args = ap.parse_args()
+
+    if not HAVE_ARROW:
+        sys.exit("pyarrow is required for the season store (pip install pyarrow)")
+
+    if args.action == "import":
+        imported = import_csvs(args.season)
+        for kind, weeks in imported.items():
+            print(f"{kind}: {len(weeks)} weeks -> {STORE_DIR}/season={args.season}/kind={kind}")
+        return
+
+    weeks = None
+    if args.weeks:
+        lo, _, hi = args.weeks.partition("-")
+        weeks = range(int(lo), int(hi or lo) + 1)
+    columns = args.columns.split(",") if args.columns else None
+    df = load(args.kind, weeks, columns, args.season)
+    print(df.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
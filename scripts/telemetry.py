@@ -0,0 +1,178 @@
+# telemetry.py
+import os, json, time, threading, datetime as dt
+from contextlib import contextmanager
+
+import api_client
+
+REPORT_DIR = "data/cache/reports"
+METRIC_PREFIX = "nfl_league"
+
+class Counters:
+    """HTTP totals for the process, fed by the api_client and Supabase request hooks."""
+
+    FIELDS = ("http_calls", "http_bytes", "http_retries", "http_errors", "http_seconds",
+              "supabase_calls", "supabase_errors", "supabase_seconds")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.values = dict.fromkeys(self.FIELDS, 0)
+
+    def on_response(self, url, status, nbytes, retries, seconds):
+        with self._lock:
+            self.values["http_calls"] += 1
+            self.values["http_bytes"] += nbytes
+            self.values["http_retries"] += retries
+            # Status 0: no response at all (retries exhausted on connect, timeout)
+            self.values["http_errors"] += status >= 400 or status == 0
+            self.values["http_seconds"] += seconds
+
+    def on_supabase(self, method, url, status, seconds):
+        with self._lock:
+            self.values["supabase_calls"] += 1
+            self.values["supabase_errors"] += status >= 400
+            self.values["supabase_seconds"] += seconds
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.values)
+
+class Span:
+    def __init__(self, stage):
+        self.stage = stage
+        self.rows = None
+        self.status = "ok"
+        self.seconds = 0.0
+        self.http = {}
+
+    def to_dict(self):
+        out = {"stage": self.stage, "seconds": round(self.seconds, 4), "status": self.status}
+        if self.rows is not None:
+            out["rows"] = int(self.rows)
+        out.update({k: round(v, 4) if isinstance(v, float) else v for k, v in self.http.items() if v})
+        return out
+
+class Run:
+    """Stage timings and HTTP counts for one script run.
+
+    Use `with run.span("stage") as s:` around each stage and set `s.rows`
+    to the number of rows it produced. The HTTP fields on each span are the
+    change in the process counters while it was open.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        self.started_at = dt.datetime.now(dt.timezone.utc)
+        self._start = time.perf_counter()
+        self.spans = []
+        self.status = "ok"
+        self.counters = Counters()
+        api_client.add_response_hook(self.counters.on_response)
+        try:
+            from supabase_integration import add_request_hook
+            add_request_hook(self.counters.on_supabase)
+        except ImportError:
+            pass
+
+    def close(self):
+        """Stop counting; a later Run in the same process starts from its own hooks."""
+        api_client.remove_response_hook(self.counters.on_response)
+        try:
+            from supabase_integration import remove_request_hook
+            remove_request_hook(self.counters.on_supabase)
+        except ImportError:
+            pass
+
+    @contextmanager
+    def span(self, stage, rows=None):
+        span = Span(stage)
+        span.rows = rows
+        before = self.counters.snapshot()
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            span.seconds = time.perf_counter() - start
+            after = self.counters.snapshot()
+            span.http = {k: after[k] - before[k] for k in Counters.FIELDS}
+            self.spans.append(span)
+
+    def report(self):
+        return {
+            "script": self.script,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "seconds": round(time.perf_counter() - self._start, 4),
+            "status": self.status,
+            "totals": {k: round(v, 4) if isinstance(v, float) else v for k, v in self.counters.snapshot().items()},
+            "stages": [s.to_dict() for s in self.spans],
+        }
+
+    def prometheus(self):
+        """The report in Prometheus text exposition format (node exporter textfile collector)."""
+        report = self.report()
+        script = report["script"]
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}")
+
+        base = {"script": script}
+        metric("run_seconds", "gauge", "Wall time of the last run.", [(base, report["seconds"])])
+        metric("run_success", "gauge", "1 if the last run finished without error.",
+               [(base, int(report["status"] == "ok"))])
+        metric("run_timestamp_seconds", "gauge", "Unix time the last run started.",
+               [(base, int(self.started_at.timestamp()))])
+        stage_fields = [("seconds", "stage_seconds", "Wall time per stage."),
+                        ("rows", "stage_rows", "Rows processed per stage."),
+                        ("http_calls", "stage_http_requests", "HTTP requests per stage."),
+                        ("http_bytes", "stage_http_bytes", "Response bytes per stage."),
+                        ("http_retries", "stage_http_retries", "Retried HTTP attempts per stage."),
+                        ("supabase_calls", "stage_supabase_requests", "Supabase requests per stage.")]
+        for field, name, help_text in stage_fields:
+            samples = [({**base, "stage": s["stage"]}, s.get(field, 0)) for s in report["stages"]]
+            metric(name, "gauge", help_text, samples)
+        return "\n".join(lines) + "\n"
+
+    def write(self, report_path=None, prom_path=None):
+        """Write the JSON report (default data/cache/reports/<script>.json) and optional textfile."""
+        report_path = report_path or os.path.join(REPORT_DIR, f"{self.script}.json")
+        _atomic_write(report_path, json.dumps(self.report(), indent=2) + "\n")
+        if prom_path:
+            _atomic_write(prom_path, self.prometheus())
+        return report_path
+
+    def summary(self):
+        parts = [f"{s.stage} {s.seconds:.2f}s" for s in self.spans]
+        return f"{self.script}: " + ", ".join(parts)
+
+def _atomic_write(path, text):
+    # The textfile collector may read at any moment, so never expose a partial file
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+@contextmanager
+def run_report(script, report_path=None, prom_path=None):
+    """Run context for a script's main(): writes the report however the run ends."""
+    run = Run(script)
+    try:
+        yield run
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            run.status = "error"
+        raise
+    except BaseException:
+        run.status = "error"
+        raise
+    finally:
+        run.close()
+        path = run.write(report_path, prom_path)
+        print(f"\nRun report: {path} ({run.summary()})")
@@ -12,33 +12,200 @@ from datetime import datetime
 import argparse
 import sys
 import os
+import re
+import gzip
+import hashlib
 from dateutil import parser as date_parser
 import pytz
+from concurrent.futures import ThreadPoolExecutor
+import api_client
+from api_client import get_json, get_session
+from api_cache import ENDPOINT_TTLS
+import forecast_grid
+import telemetry
+
+# OpenWeatherMap free tier allows 60 calls/minute; keep a few in flight at most
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_TIMEOUT = 15
+
+GEOCODE_CACHE = 'data/weather/geocode_cache.json'
+RAW_FORECAST_DIR = 'data/weather/raw'
 
 class WeatherAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, timeout=REQUEST_TIMEOUT, ttl=ENDPOINT_TTLS['forecast']):
         self.api_key = api_key
-        self.base_url = "https://api.openweathermap.org/data/2.5/forecast"
+        self.base_url = f"{api_client.base_url('openweathermap')}/data/2.5/forecast"
+        self.timeout = timeout
+        # Forecasts go through the shared response cache (see api_cache.py)
+        self.ttl = ttl
+        # Retries on connection errors, 429 and 5xx come from the session's adapter
+        self.session = get_session("openweathermap")
     
-    def get_forecast(self, city, state):
-        """Get 5-day weather forecast for a city"""
-        # Format: "City,State,US" for better accuracy
-        location = f"{city},{state},US"
-        
+    def get_forecast(self, city, state, lat=None, lon=None):
+        """Get 5-day weather forecast for a stadium, by coordinates when known"""
         params = {
-            'q': location,
             'appid': self.api_key,
             'units': 'imperial',  # Fahrenheit
             'cnt': 40  # 5 days * 8 forecasts per day (3-hour intervals)
         }
+        if lat is not None and lon is not None:
+            params.update({'lat': lat, 'lon': lon})
+        else:
+            # Format: "City,State,US" for better accuracy
+            params['q'] = f"{city},{state},US"
         
         try:
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return get_json(self.base_url, params, timeout=self.timeout, session=self.session, ttl=self.ttl)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching weather for {city}, {state}: {e}")
             return None
+    
+    def geocode(self, city, state):
+        """Look up (lat, lon) for a US city via the OpenWeatherMap geocoding API"""
+        params = {'q': f"{city},{state},US", 'limit': 1, 'appid': self.api_key}
+        try:
+            matches = get_json(f"{api_client.base_url('openweathermap')}/geo/1.0/direct", params,
+                               timeout=self.timeout, session=self.session)
+        except requests.exceptions.RequestException as e:
+            print(f"Error geocoding {city}, {state}: {e}")
+            return None
+        if not matches:
+            return None
+        return matches[0]['lat'], matches[0]['lon']
+
+def stadium_key(info):
+    """Filesystem-safe key for a stadium (shared stadiums share a key)"""
+    return re.sub(r'[^a-z0-9]+', '_', info['stadium'].lower()).strip('_')
+
+def resolve_coordinates(weather_api, stadiums, cache_path=GEOCODE_CACHE):
+    """Fill in lat/lon for stadiums missing them, geocoding each city once and caching on disk"""
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+    
+    changed = False
+    for info in stadiums.values():
+        if info.get('lat') is not None and info.get('lon') is not None:
+            continue
+        location = f"{info['city']},{info['state']},US"
+        if location not in cache:
+            coords = weather_api.geocode(info['city'], info['state'])
+            if coords is None:
+                continue
+            cache[location] = list(coords)
+            changed = True
+        info['lat'], info['lon'] = cache[location]
+    
+    if changed:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    return stadiums
+
+def latest_raw_path(key, raw_dir=RAW_FORECAST_DIR):
+    """Uncompressed copy of a stadium's newest record, so readers needn't scan the history (gitignored)"""
+    return os.path.join(raw_dir, f"{key}.latest.json")
+
+def latest_raw_record(key, raw_dir=RAW_FORECAST_DIR):
+    """Newest record for a stadium key with its digest, or None
+    
+    The .latest.json copy is trusted only while the history is the size it
+    was written against; after a pull brings in newer records it is stale,
+    and the history is scanned instead.
+    """
+    path = os.path.join(raw_dir, f"{key}.jsonl.gz")
+    if not os.path.exists(path):
+        return None
+    latest_path = latest_raw_path(key, raw_dir)
+    if os.path.exists(latest_path):
+        with open(latest_path, 'r') as f:
+            latest = json.load(f)
+        if latest.get('history_size') == os.path.getsize(path):
+            return latest
+    record = None
+    for record in iter_raw_forecasts(key, raw_dir):
+        pass
+    return dict(record, digest=forecast_digest(record['forecast'])) if record else None
+
+def forecast_digest(forecast):
+    return hashlib.sha256(json.dumps(forecast, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def save_raw_forecast(info, teams, forecast, forecast_time, raw_dir=RAW_FORECAST_DIR):
+    """Append one raw forecast to the stadium's gzip JSON-lines sidecar
+    
+    A forecast identical to the last stored one (e.g. served again from the
+    response cache) is not appended; returns None in that case.
+    """
+    os.makedirs(raw_dir, exist_ok=True)
+    key = stadium_key(info)
+    path = os.path.join(raw_dir, f"{key}.jsonl.gz")
+    digest = forecast_digest(forecast)
+    latest = latest_raw_record(key, raw_dir)
+    if latest and latest['digest'] == digest:
+        return None
+    record = {'stadium': info['stadium'], 'teams': teams, 'forecast_time': forecast_time, 'forecast': forecast}
+    # Each append is its own gzip member; gzip readers stream them back as one file
+    with gzip.open(path, 'at', encoding='utf-8') as f:
+        f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    latest_path = latest_raw_path(key, raw_dir)
+    tmp = latest_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(dict(record, digest=digest, history_size=os.path.getsize(path)), f, separators=(',', ':'))
+    os.replace(tmp, latest_path)
+    return path
+
+def iter_raw_forecasts(stadium, raw_dir=RAW_FORECAST_DIR):
+    """Lazily yield every stored record for a stadium name or key, oldest first"""
+    key = stadium_key({'stadium': stadium}) if not re.fullmatch(r'[a-z0-9_]+', stadium) else stadium
+    path = os.path.join(raw_dir, f"{key}.jsonl.gz")
+    if not os.path.exists(path):
+        return
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+def load_raw_forecast(stadium, raw_dir=RAW_FORECAST_DIR):
+    """Latest raw forecast JSON for a stadium, or None"""
+    key = stadium_key({'stadium': stadium}) if not re.fullmatch(r'[a-z0-9_]+', stadium) else stadium
+    latest = latest_raw_record(key, raw_dir)
+    return latest['forecast'] if latest else None
+
+def migrate_raw_column(csv_path, raw_dir=RAW_FORECAST_DIR):
+    """Move an old CSV's raw_data column into sidecars and rewrite the CSV without it"""
+    df = pd.read_csv(csv_path)
+    if 'raw_data' not in df.columns:
+        return 0
+    moved = 0
+    for stadium, rows in df[df['raw_data'].notna()].groupby('stadium', sort=False):
+        first = rows.iloc[0]
+        save_raw_forecast({'stadium': stadium}, rows['team'].tolist(),
+                          json.loads(first['raw_data']), first['forecast_time'], raw_dir)
+        moved += 1
+    df.drop(columns='raw_data').to_csv(csv_path, index=False)
+    return moved
+
+def fetch_forecasts(weather_api, stadiums, max_workers=MAX_CONCURRENT_REQUESTS):
+    """Fetch forecasts for {team: stadium_info} concurrently; returns {team: forecast or None}
+    
+    Teams that share a stadium share a single request; fresh forecasts come
+    from the response cache without a network call.
+    """
+    by_stadium = {}
+    for team, info in stadiums.items():
+        by_stadium.setdefault(stadium_key(info), info)
+    
+    forecasts = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            key: pool.submit(weather_api.get_forecast, info['city'], info['state'],
+                             info.get('lat'), info.get('lon'))
+            for key, info in by_stadium.items()
+        }
+        for key, future in futures.items():
+            forecasts[key] = future.result()
+    
+    return {team: forecasts[stadium_key(info)] for team, info in stadiums.items()}
 
 def load_stadium_data():
     """Load stadium information from YAML file"""
@@ -61,151 +228,168 @@ def get_outdoor_stadiums():
     
     return outdoor_teams
 
+def load_neutral_sites():
+    """Load games played away from the home stadium (international, Super Bowl)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    yaml_path = os.path.join(script_dir, '..', 'nfl-pickem', 'public', 'neutralSites.yaml')
+    
+    if not os.path.exists(yaml_path):
+        return []
+    with open(yaml_path, 'r') as file:
+        data = yaml.safe_load(file)
+    
+    return data.get('games') or []
+
+def parse_kickoff(kickoff_str):
+    """Parse a lines-CSV kickoff (with or without UTC offset) into an ET-aware datetime"""
+    et_tz = pytz.timezone('America/New_York')
+    kickoff_dt = date_parser.parse(str(kickoff_str))
+    # Assume ET timezone if not specified
+    if kickoff_dt.tzinfo is None:
+        return et_tz.localize(kickoff_dt)
+    return kickoff_dt.astimezone(et_tz)
+
 def load_games_data(games_csv_path):
-    """Load game data with kickoff times"""
+    """Load the week's games as [{'home', 'away', 'kickoff'}] from a lines CSV"""
     if not games_csv_path or not os.path.exists(games_csv_path):
-        return {}
+        return []
     
     try:
         games_df = pd.read_csv(games_csv_path)
-        games_dict = {}
-        
-        for _, row in games_df.iterrows():
-            # Parse kickoff time (assuming ET timezone)
-            kickoff_str = row['kickoff_et']
-            # Remove timezone suffix if present and parse
-            if kickoff_str.endswith('-05:00'):
-                kickoff_str = kickoff_str[:-6]
-            
-            kickoff_dt = date_parser.parse(kickoff_str)
-            # Assume ET timezone if not specified
-            et_tz = pytz.timezone('America/New_York')
-            if kickoff_dt.tzinfo is None:
-                kickoff_dt = et_tz.localize(kickoff_dt)
-            
-            # Store game time for both teams (since weather matters for the stadium location)
-            home_team = row['home']
-            away_team = row['away']
-            games_dict[home_team] = kickoff_dt
-            games_dict[away_team] = kickoff_dt
-            
-        return games_dict
+        return [
+            {'home': row['home'], 'away': row['away'], 'kickoff': parse_kickoff(row['kickoff_et'])}
+            for row in games_df[['home', 'away', 'kickoff_et']].dropna().to_dict('records')
+        ]
     except Exception as e:
         print(f"Error loading games data: {e}")
-        return {}
-
-def generate_weather_summary(forecast_data, target_date=None):
-    """Generate a concise weather summary for game conditions"""
-    if not forecast_data or 'list' not in forecast_data:
-        return "Weather data unavailable"
-    
-    # If target_date is provided, find the closest forecast
-    # Otherwise, use the first forecast (next 3 hours)
-    forecast = forecast_data['list'][0]
-    
-    if target_date:
-        # Find forecast closest to target date
-        target_timestamp = int(target_date.timestamp())
-        closest_forecast = min(forecast_data['list'], 
-                             key=lambda x: abs(x['dt'] - target_timestamp))
-        forecast = closest_forecast
-    
-    # Extract weather data
-    temp = round(forecast['main']['temp'])
-    feels_like = round(forecast['main']['feels_like'])
-    humidity = forecast['main']['humidity']
-    wind_speed = round(forecast['wind']['speed'])
-    wind_gust = round(forecast['wind'].get('gust', 0))
-    
-    # Weather conditions
-    weather = forecast['weather'][0]
-    condition = weather['main']
-    description = weather['description']
-    
-    # Precipitation
-    rain_chance = forecast.get('pop', 0) * 100  # Probability of precipitation
-    rain_amount = forecast.get('rain', {}).get('3h', 0)
-    snow_amount = forecast.get('snow', {}).get('3h', 0)
-    
-    # Generate summary
-    summary_parts = []
-    
-    # Temperature
-    if abs(temp - feels_like) > 5:
-        summary_parts.append(f"{temp}°F (feels {feels_like}°F)")
-    else:
-        summary_parts.append(f"{temp}°F")
-    
-    # Precipitation
-    if rain_chance > 20:
-        if rain_amount > 0:
-            summary_parts.append(f"{rain_chance:.0f}% chance rain ({rain_amount:.2f}\")")
-        else:
-            summary_parts.append(f"{rain_chance:.0f}% chance rain")
-    
-    if snow_amount > 0:
-        summary_parts.append(f"Snow expected ({snow_amount:.2f}\")")
-    
-    # Wind
-    if wind_speed > 10 or wind_gust > 15:
-        if wind_gust > wind_speed + 5:
-            summary_parts.append(f"Windy ({wind_speed}mph, gusts {wind_gust}mph)")
-        else:
-            summary_parts.append(f"Windy ({wind_speed}mph)")
-    
-    # Weather condition if notable
-    if condition.lower() in ['thunderstorm', 'snow', 'fog', 'mist']:
-        summary_parts.append(description.title())
-    
-    if not summary_parts:
-        summary_parts.append("Clear conditions")
+        return []
+
+def resolve_venue(game, stadiums, neutral_sites):
+    """Where a game is actually played: a neutral-site entry if one matches, else the home stadium"""
+    game_date = game['kickoff'].date().isoformat()
+    for site in neutral_sites:
+        if str(site['date']) != game_date:
+            continue
+        if site.get('home') in (None, game['home']) and site.get('away') in (None, game['away']):
+            venue = {k: v for k, v in site.items() if k not in ('date', 'home', 'away')}
+            venue.setdefault('state', venue.get('country', ''))
+            venue['neutral'] = True
+            return venue
+    venue = stadiums.get(game['home'])
+    return dict(venue, neutral=False) if venue else None
+
+def plan_weather_fetches(games, stadiums, neutral_sites):
+    """Resolve each game to its venue and keep only outdoor ones
     
-    return " | ".join(summary_parts)
+    Returns ({venue_key: venue_info}, [(game, venue_key)]) so each venue
+    hosting an outdoor game is fetched exactly once.
+    """
+    venues = {}
+    game_venues = []
+    for game in games:
+        venue = resolve_venue(game, stadiums, neutral_sites)
+        if venue is None:
+            print(f"Warning: No venue found for {game['away']} @ {game['home']}")
+            continue
+        if venue['type'] != 'outdoor':
+            continue
+        key = stadium_key(venue)
+        venues.setdefault(key, venue)
+        game_venues.append((game, key))
+    return venues, game_venues
 
 def main():
     parser = argparse.ArgumentParser(description='Fetch NFL weather forecasts')
-    parser.add_argument('--api-key', required=True, help='OpenWeatherMap API key')
+    parser.add_argument('--api-key', help='OpenWeatherMap API key')
     parser.add_argument('--output', default='data/weather/weather_forecast.csv', 
                        help='Output CSV file path')
     parser.add_argument('--games-csv', 
                        help='Path to games CSV file with kickoff times')
     parser.add_argument('--test', action='store_true', 
                        help='Test with a few stadiums only')
+    parser.add_argument('--max-workers', type=int, default=MAX_CONCURRENT_REQUESTS,
+                       help='Maximum concurrent forecast requests')
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT,
+                       help='Per-request timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always refetch forecasts instead of reusing cached ones (new responses are still cached)')
+    parser.add_argument('--raw-dir', default=RAW_FORECAST_DIR,
+                       help='Directory for compressed per-stadium raw forecast sidecars')
+    parser.add_argument('--migrate-csv', nargs='+', metavar='CSV',
+                       help='Move the raw_data column of existing CSVs into sidecars and exit')
+    parser.add_argument('--base-url',
+                       help='OpenWeatherMap API root, e.g. a local stand-in (or set OPENWEATHER_BASE_URL)')
+    parser.add_argument('--report',
+                       help='Run report JSON path (default: data/cache/reports/weather_script.json)')
+    parser.add_argument('--prom-textfile',
+                       help='Also write the run\'s metrics here for the node exporter textfile collector')
     
     args = parser.parse_args()
     
-    # Initialize weather API
-    weather_api = WeatherAPI(args.api_key)
+    if args.migrate_csv:
+        for path in args.migrate_csv:
+            moved = migrate_raw_column(path, args.raw_dir)
+            print(f"{path}: moved {moved} raw forecasts to {args.raw_dir}")
+        return
+    
+    if not args.api_key:
+        parser.error('--api-key is required')
+    if args.base_url:
+        api_client.set_base_url('openweathermap', args.base_url)
+    api_client.configure(refresh=args.no_cache)
     
-    # Load game data with kickoff times
-    games_data = {}
-    if args.games_csv:
-        games_data = load_games_data(args.games_csv)
-        print(f"Loaded kickoff times for {len(games_data)} games")
+    with telemetry.run_report('weather_script', args.report, args.prom_textfile) as run:
+        fetch_weather(args, run)
+
+def fetch_weather(args, run):
+    """Plan, fetch and summarize the week's forecasts, timing each stage on `run`."""
+    # Initialize weather API
+    weather_api = WeatherAPI(args.api_key, timeout=args.timeout)
     
-    # Get outdoor stadiums
-    outdoor_stadiums = get_outdoor_stadiums()
+    # With a lines CSV, fetch only venues hosting outdoor games this week;
+    # otherwise fall back to every outdoor stadium (current conditions)
+    with run.span('plan_venues') as span:
+        games = load_games_data(args.games_csv) if args.games_csv else []
+        span.rows = len(games)
+    if games:
+        venues, game_venues = plan_weather_fetches(games, load_stadium_data(), load_neutral_sites())
+        print(f"Loaded {len(games)} games; {len(game_venues)} outdoor games at {len(venues)} venues")
+    else:
+        venues = {stadium_key(info): info for info in get_outdoor_stadiums().values()}
+        game_venues = [({'home': team, 'away': '', 'kickoff': None}, stadium_key(info))
+                       for team, info in get_outdoor_stadiums().items()]
     
     if args.test:
         # Test with just a few stadiums
         test_teams = ['Green Bay Packers', 'Buffalo Bills', 'Chicago Bears']
-        outdoor_stadiums = {k: v for k, v in outdoor_stadiums.items() if k in test_teams}
+        game_venues = [(g, key) for g, key in game_venues if g['home'] in test_teams]
+        venues = {key: venues[key] for _, key in game_venues}
     
-    print(f"Fetching weather for {len(outdoor_stadiums)} outdoor stadiums...")
+    print(f"Fetching weather for {len(venues)} outdoor venues...")
     
     weather_data = []
+    raw_saved = set()
+    forecast_time = datetime.now().isoformat()
+    with run.span('geocode', rows=len(venues)):
+        resolve_coordinates(weather_api, venues)
+    with run.span('fetch_forecasts', rows=len(venues)):
+        forecasts = fetch_forecasts(weather_api, venues, args.max_workers)
     
-    for team, stadium_info in outdoor_stadiums.items():
-        print(f"Getting weather for {team} ({stadium_info['city']}, {stadium_info['state']})...")
+    # Interpolate every game's kickoff and game-window conditions in one batch
+    with run.span('game_conditions', rows=len(game_venues)):
+        conditions = forecast_grid.game_conditions(forecasts, [(key, game['kickoff']) for game, key in game_venues])
+    
+    for (game, key), (_, cond) in zip(game_venues, conditions.iterrows()):
+        team = game['home']
+        stadium_info = venues[key]
+        matchup = f"{game['away']} @ {team}" if game['away'] else team
+        print(f"Weather for {matchup} ({stadium_info['stadium']}, {stadium_info['city']}):")
         
-        forecast_data = weather_api.get_forecast(stadium_info['city'], stadium_info['state'])
+        forecast_data = forecasts[key]
         
         if forecast_data:
-            # Get game time if available
-            game_time = games_data.get(team)
-            
-            # Generate summary for game time or current conditions
-            summary = generate_weather_summary(forecast_data, game_time)
+            game_time = game['kickoff']
+            summary = forecast_grid.summarize(cond)
             
             time_info = f" at game time ({game_time.strftime('%m/%d %I:%M%p')})" if game_time else ""
             
@@ -215,24 +399,32 @@ def main():
                 'city': stadium_info['city'],
                 'state': stadium_info['state'],
                 'weather_summary': summary,
-                'forecast_time': datetime.now().isoformat(),
+                'forecast_time': forecast_time,
                 'game_time': game_time.isoformat() if game_time else '',
-                'raw_data': json.dumps(forecast_data)  # Store raw data for detailed analysis
+                **{col: (round(cond[col], 1) if isinstance(cond[col], float) else cond[col])
+                   for col in forecast_grid.COLUMNS}
             })
             
+            # Raw data for detailed analysis goes to the venue's sidecar, once per venue
+            if key not in raw_saved:
+                teams = [g['home'] for g, k in game_venues if k == key]
+                save_raw_forecast(stadium_info, teams, forecast_data, forecast_time, args.raw_dir)
+                raw_saved.add(key)
+            
             print(f"  {summary}{time_info}")
         else:
             print(f"  Failed to get weather data")
     
-    # Create output directory if it doesn't exist
-    os.makedirs(os.path.dirname(args.output), exist_ok=True)
-    
-    # Save to CSV
-    df = pd.DataFrame(weather_data)
-    df.to_csv(args.output, index=False)
+    with run.span('save_forecasts', rows=len(weather_data)):
+        # Create output directory if it doesn't exist
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        
+        # Save to CSV
+        df = pd.DataFrame(weather_data)
+        df.to_csv(args.output, index=False)
     
     print(f"\nWeather data saved to {args.output}")
-    print(f"Retrieved weather for {len(weather_data)} stadiums")
+    print(f"Retrieved weather for {len(weather_data)} games")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,39 @@
+-- Leaderboard aggregation for the NFL Spread League
+-- Run in the Supabase SQL Editor (or against a local Postgres with the same
+-- picks table) to let scripts read standings without pulling every pick.
+
+-- A week counts as graded once any pick in it has a result, so NULL picks in
+-- graded weeks are pushes and NULL picks in ungraded weeks are pending.
+CREATE OR REPLACE VIEW leaderboard AS
+WITH graded_weeks AS (
+  SELECT DISTINCT week FROM picks WHERE correct IS NOT NULL
+)
+SELECT
+  p.user_id AS "user",
+  COUNT(*) AS total_picks,
+  COUNT(*) FILTER (WHERE p.correct IS TRUE) AS correct_picks,
+  COUNT(*) FILTER (WHERE p.correct IS FALSE) AS losses,
+  COUNT(*) FILTER (WHERE p.correct IS NULL AND g.week IS NOT NULL) AS pushes,
+  COUNT(*) FILTER (WHERE p.correct IS NULL AND g.week IS NULL) AS pending,
+  ROUND(100.0 * COUNT(*) FILTER (WHERE p.correct IS TRUE) / COUNT(*), 1) AS percentage
+FROM picks p
+LEFT JOIN graded_weeks g ON g.week = p.week
+GROUP BY p.user_id;
+
+CREATE OR REPLACE FUNCTION get_leaderboard()
+RETURNS SETOF leaderboard
+LANGUAGE sql STABLE
+AS $$
+  SELECT * FROM leaderboard ORDER BY percentage DESC, correct_picks DESC;
+$$;
+
+CREATE OR REPLACE FUNCTION get_user_stats(p_user_id TEXT)
+RETURNS SETOF leaderboard
+LANGUAGE sql STABLE
+AS $$
+  SELECT * FROM leaderboard WHERE "user" = p_user_id;
+$$;
+
+GRANT SELECT ON leaderboard TO anon;
+GRANT EXECUTE ON FUNCTION get_leaderboard() TO anon;
+GRANT EXECUTE ON FUNCTION get_user_stats(TEXT) TO anon;
@@ -0,0 +1,35 @@
+-- Precomputed snapshots the frontend reads (leaderboard standings, live
+-- cover status). Scripts write through publish_snapshot(), which bumps the
+-- version on the server so runs from different machines never collide.
+-- Only the service role may publish; the anon key the app ships can only read.
+
+CREATE TABLE IF NOT EXISTS snapshots (
+  name TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 1,
+  data JSONB NOT NULL,
+  generated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Runs with the caller's rights: service_role bypasses RLS, anon has no write policy
+CREATE OR REPLACE FUNCTION publish_snapshot(p_name TEXT, p_data JSONB)
+RETURNS INTEGER
+LANGUAGE sql SECURITY INVOKER
+AS $$
+  INSERT INTO snapshots (name, data) VALUES (p_name, p_data)
+  ON CONFLICT (name) DO UPDATE
+    SET version = snapshots.version + 1, data = EXCLUDED.data, generated_at = NOW()
+  RETURNING version;
+$$;
+
+ALTER TABLE snapshots ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Allow read on snapshots" ON snapshots;
+CREATE POLICY "Allow read on snapshots" ON snapshots FOR SELECT TO anon USING (true);
+
+GRANT SELECT ON snapshots TO anon;
+REVOKE INSERT, UPDATE, DELETE ON snapshots FROM anon, authenticated;
+GRANT SELECT, INSERT, UPDATE ON snapshots TO service_role;
+
+-- Functions are executable by PUBLIC (and, on Supabase, anon) by default
+REVOKE EXECUTE ON FUNCTION publish_snapshot(TEXT, JSONB) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION publish_snapshot(TEXT, JSONB) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION publish_snapshot(TEXT, JSONB) TO service_role;
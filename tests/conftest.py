@@ -0,0 +1,6 @@
+# conftest.py
+import os
+import sys
+
+# The scripts import each other as flat modules, as when run from scripts/
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
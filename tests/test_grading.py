@@ -0,0 +1,152 @@
+# test_grading.py
+import numpy as np
+import pandas as pd
+
+from grading import (ats_outcome, grade_ats, build_team_index, pick_event_ids,
+                     grade_picks, grade_locked_picks, live_cover_status)
+
+def lines(**extra):
+    df = pd.DataFrame({
+        "kickoff_et": ["2025-09-07 13:00:00-04:00", "2025-09-07 16:25:00-04:00"],
+        "away": ["Dallas Cowboys", "Buffalo Bills"],
+        "home": ["Philadelphia Eagles", "Miami Dolphins"],
+        "spread_away": [7.0, -3.0],
+        "spread_home": [-7.0, 3.0],
+        "total": [47.5, 44.0],
+    })
+    return df.assign(**extra)
+
+def results(**extra):
+    df = pd.DataFrame({
+        "kickoff_et": pd.to_datetime(["2025-09-07 13:00:00-04:00", "2025-09-07 16:25:00-04:00"]),
+        "away": ["Dallas Cowboys", "Buffalo Bills"],
+        "home": ["Philadelphia Eagles", "Miami Dolphins"],
+        "away_score": [20, 24],
+        "home_score": [24, 21],
+    })
+    return df.assign(**extra)
+
+def test_ats_outcome():
+    assert list(ats_outcome([1.5, -0.5, 0])) == ["W", "L", "P"]
+
+def test_grade_ats():
+    ats = grade_ats(results(), lines())
+    # Eagles won by 4 laying 7: Cowboys cover. Bills won by 3 laying 3: push.
+    assert list(ats["home_ats_result"]) == ["L", "P"]
+    assert list(ats["away_ats_result"]) == ["W", "P"]
+    assert list(ats["over_under"]) == ["Under", "Over"]
+    assert "game_id" not in ats.columns
+
+def test_grade_ats_drops_games_without_lines(capsys):
+    ats = grade_ats(results(), lines().iloc[:1])
+    assert list(ats["home"]) == ["Philadelphia Eagles"]
+    assert "No odds found for Buffalo Bills @ Miami Dolphins" in capsys.readouterr().out
+
+def test_grade_ats_keyed_by_week():
+    odds = pd.concat([lines(week=1), lines(week=2).assign(spread_home=[-3.0, 1.0], spread_away=[3.0, -1.0])])
+    res = pd.concat([results(week=1), results(week=2)])
+    ats = grade_ats(res, odds, keys=("week", "home", "away"))
+    assert list(ats["week"]) == [1, 1, 2, 2]
+    assert list(ats["home_spread"]) == [-7.0, 3.0, -3.0, 1.0]
+
+def test_grade_ats_matches_event_ids_before_teams():
+    # Same matchup listed twice: only the event id tells the rows apart
+    odds = pd.concat([lines().iloc[:1], lines().iloc[:1].assign(spread_home=-2.0, spread_away=2.0)])
+    odds["game_id"] = ["e1", "e2"]
+    ats = grade_ats(results().iloc[:1].assign(game_id="e2"), odds)
+    assert list(ats["home_spread"]) == [-2.0]
+    assert list(ats["game_id"]) == ["e2"]
+
+def test_grade_ats_falls_back_to_teams_for_unknown_ids():
+    ats = grade_ats(results(game_id=["playoff-1", "playoff-2"]), lines(game_id=["e1", "e2"]))
+    assert list(ats["home_spread"]) == [-7.0, 3.0]
+
+def test_build_team_index():
+    index = build_team_index(grade_ats(results(), lines()))
+    cowboys = index.loc["Dallas Cowboys"]
+    assert cowboys["opponent"] == "Philadelphia Eagles"
+    assert cowboys["result"] == "W"
+    assert cowboys["line"] == 7.0
+    assert cowboys["margin"] == -4
+    assert cowboys["game_date"] == "2025-09-07"
+
+def test_grade_picks(capsys):
+    picks = pd.DataFrame({"user": ["cam", "cam", "max"],
+                          "team": ["Dallas Cowboys", "Miami Dolphins", "Chicago Bears"]})
+    graded = grade_picks(grade_ats(results(), lines()), picks)
+    assert list(graded["result"]) == ["W", "P"]
+    assert list(graded.columns) == ["user", "team", "opponent", "result", "game_date"]
+    assert "No result found for max's pick: Chicago Bears" in capsys.readouterr().out
+
+def test_pick_event_ids():
+    week = lines(game_id=["e1", "e2"])
+    picks = pd.DataFrame({"game_id": ["2", "playoff-1", "1-ou", "9", None]})
+    ids = pick_event_ids(picks, week)
+    assert list(ids.iloc[:3]) == ["e2", "e1", "e1"]
+    assert ids.iloc[3:].isna().all()
+
+def test_pick_event_ids_without_ids_in_lines():
+    picks = pd.DataFrame({"game_id": ["1"]})
+    assert pick_event_ids(picks, lines()).isna().all()
+
+def rematch():
+    """Two meetings of the same teams in one grading window, home and away swapped."""
+    week = pd.DataFrame({
+        "kickoff_et": ["2025-09-07 13:00:00-04:00", "2025-09-14 13:00:00-04:00"],
+        "away": ["Dallas Cowboys", "Philadelphia Eagles"],
+        "home": ["Philadelphia Eagles", "Dallas Cowboys"],
+        "spread_away": [7.0, -2.5], "spread_home": [-7.0, 2.5], "total": [47.5, 45.0],
+        "game_id": ["e1", "e2"],
+    })
+    scores = pd.DataFrame({
+        "game_id": ["e1", "e2"],
+        "kickoff_et": pd.to_datetime(week["kickoff_et"]),
+        "away": week["away"], "home": week["home"],
+        "away_score": [20, 17], "home_score": [24, 31],
+    })
+    return week, grade_ats(scores, week)
+
+def test_grade_picks_by_event_id():
+    week, ats = rematch()
+    picks = pd.DataFrame({"user": ["cam", "cam"], "team": ["Dallas Cowboys", "Dallas Cowboys"],
+                          "game_id": ["1", "2"]})
+    # By team alone both picks land on the first meeting
+    assert list(grade_picks(ats, picks)["game_date"]) == ["2025-09-07", "2025-09-07"]
+    graded = grade_picks(ats, picks, lines_df=week)
+    assert list(graded["game_date"]) == ["2025-09-07", "2025-09-14"]
+    assert list(graded["result"]) == ["W", "W"]
+
+def test_grade_picks_by_event_id_falls_back_to_team():
+    week, ats = rematch()
+    picks = pd.DataFrame({"user": ["cam"], "team": ["Philadelphia Eagles"], "game_id": ["junk"]})
+    graded = grade_picks(ats, picks, lines_df=week)
+    assert list(graded["game_date"]) == ["2025-09-07"]
+
+def test_grade_locked_picks():
+    ats = grade_ats(results(), lines())
+    picks = pd.DataFrame({"user": ["cam", "max", "john"],
+                          "team": ["Philadelphia Eagles", "Philadelphia Eagles", "Buffalo Bills"],
+                          "spread": [-3.5, np.nan, -2.5]}, index=[10, 11, 12])
+    graded = grade_locked_picks(ats, picks)
+    # Eagles by 4: covers -3.5, not the week's -7; Bills by 3 cover -2.5
+    assert list(graded["spread"]) == [-3.5, -7.0, -2.5]
+    assert list(graded["result"]) == ["W", "L", "W"]
+    # regrade writes results back by the picks' own index
+    assert list(graded.index) == [10, 11, 12]
+
+def test_grade_locked_picks_by_event_id():
+    week, ats = rematch()
+    picks = pd.DataFrame({"user": ["cam"], "team": ["Dallas Cowboys"], "game_id": ["2"], "spread": [-10.5]})
+    graded = grade_locked_picks(ats, picks, lines_df=week)
+    # Cowboys won the second meeting by 14
+    assert list(graded["result"]) == ["W"]
+    assert list(graded["game_date"]) == ["2025-09-14"]
+
+def test_live_cover_status():
+    games = results(completed=[False, True])
+    picks = pd.DataFrame({"user": ["cam", "max", "john"],
+                          "team": ["Dallas Cowboys", "Philadelphia Eagles", "Buffalo Bills"],
+                          "spread": [3.5, -3.5, -3.0]})
+    picks = pd.concat([picks, pd.DataFrame({"user": ["cam"], "team": ["O/U:OVER"], "spread": [44.0]})])
+    status = live_cover_status(games, picks)
+    assert list(status["status"]) == ["not covering", "covering", "P"]
@@ -0,0 +1,107 @@
+# test_leaderboard.py
+import os
+import uuid
+
+import pandas as pd
+import pytest
+
+import supabase_integration
+from supabase_integration import (aggregate_leaderboard, calculate_user_stats, install_sql,
+                                  get_leaderboard_from_postgres)
+from leaderboard_snapshot import build_snapshot
+
+def picks():
+    # Week 1 graded (NULL = push), week 2 graded, week 3 still pending
+    return pd.DataFrame({
+        "user_id": ["cam", "cam", "cam", "max", "max", "max", "john", "john"],
+        "week": [1, 2, 3, 1, 2, 3, 1, 2],
+        "correct": [True, True, None, None, False, None, False, True],
+    })
+
+def test_aggregate_leaderboard():
+    board = aggregate_leaderboard(picks()).set_index("user")
+    assert list(board.index) == ["cam", "john", "max"]
+    assert board.loc["cam"].to_dict() == {"total_picks": 3, "correct_picks": 2, "losses": 0,
+                                          "pushes": 0, "pending": 1, "percentage": 66.7}
+    assert board.loc["max", "pushes"] == 1 and board.loc["max", "pending"] == 1
+
+def test_build_snapshot_rank_change():
+    snapshot = build_snapshot(picks())
+    assert snapshot["through_week"] == 2
+    standings = {row["user"]: row for row in snapshot["standings"]}
+    assert standings["cam"]["rank"] == 1
+    # max and john were tied for second after week 1; john's week 2 win split them
+    assert standings["john"]["rank_change"] == 0
+    assert standings["max"]["rank_change"] == -1
+    assert snapshot["weeks"]["3"][0] == {"user": "cam", "wins": 0, "losses": 0, "pushes": 0, "pending": 1}
+
+def test_build_snapshot_ranks_by_graded_wins():
+    # A pending pick and a playoff win change nothing; equal wins share a rank
+    extra = pd.DataFrame({"user_id": ["john", "max"], "week": [3, 100], "correct": [None, True]})
+    standings = build_snapshot(pd.concat([picks(), extra]))["standings"]
+    assert [(r["user"], r["rank"], r["wins"], r["graded_picks"], r["percentage"]) for r in standings] == [
+        ("cam", 1, 2, 2, 100), ("john", 2, 1, 2, 50), ("max", 3, 0, 2, 0)]
+    tied = pd.DataFrame({"user_id": ["max"], "week": [2], "correct": [True]})
+    standings = build_snapshot(pd.concat([picks(), tied]))["standings"]
+    # max (1 of 3) ties john (1 of 2) on wins and ranks below him on percentage
+    assert [(r["user"], r["rank"]) for r in standings] == [("cam", 1), ("john", 2), ("max", 2)]
+
+class FakeQuery:
+    """Just enough of the postgrest builder for calculate_user_stats' fallback."""
+    def __init__(self, rows):
+        self.rows, self.filters = rows, {}
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def execute(self):
+        if self.rows is None:
+            raise RuntimeError("function get_user_stats does not exist")
+        rows = [r for r in self.rows if all(r[c] == v for c, v in self.filters.items())]
+        return type("Response", (), {"data": rows})()
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows, self.queries = rows, []
+
+    def rpc(self, name, params):
+        return FakeQuery(None)
+
+    def table(self, name):
+        self.queries.append(FakeQuery(self.rows))
+        return self.queries[-1]
+
+def test_calculate_user_stats_fallback_fetches_one_user(monkeypatch):
+    rows = picks().astype(object).where(picks().notna(), None).to_dict("records")
+    client = FakeClient(rows)
+    monkeypatch.setattr(supabase_integration, "get_supabase_client", lambda: client)
+    assert calculate_user_stats("max") == {"total_picks": 3, "correct_picks": 0, "percentage": 0.0}
+    assert client.queries[0].filters == {"user_id": "max"}
+    assert calculate_user_stats("nobody") == {"total_picks": 0, "correct_picks": 0, "percentage": 0}
+
+@pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="set DATABASE_URL to a scratch Postgres to test sql/")
+def test_leaderboard_view_matches_pandas():
+    psycopg2 = pytest.importorskip("psycopg2")
+    schema = f"test_{uuid.uuid4().hex[:8]}"
+    conn = psycopg2.connect(os.environ["DATABASE_URL"])
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {schema}")
+            cur.execute(f"CREATE TABLE {schema}.picks (user_id TEXT, week INTEGER, correct BOOLEAN)")
+            cur.executemany(f"INSERT INTO {schema}.picks VALUES (%s, %s, %s)",
+                            picks().astype(object).where(picks().notna(), None).values.tolist())
+        url = os.environ["DATABASE_URL"]
+        url += ("&" if "?" in url else "?") + f"options=-csearch_path%3D{schema}"
+        install_sql(url)
+        from_sql = get_leaderboard_from_postgres(url)
+        expected = aggregate_leaderboard(picks())
+        pd.testing.assert_frame_equal(from_sql.astype(expected.dtypes.to_dict()), expected)
+    finally:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.close()
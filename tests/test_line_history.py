@@ -0,0 +1,99 @@
+# test_line_history.py
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import line_history
+from line_history import LineHistory, frame_state, diff_state, game_key
+
+GAME = game_key("Dallas Cowboys", "Philadelphia Eagles")
+
+def board(spread_home=-7.0, total=47.5):
+    return pd.DataFrame({
+        "kickoff_et": ["2025-09-04T20:20:00-04:00", "2025-09-07T13:00:00-04:00"],
+        "away": ["Dallas Cowboys", "Buffalo Bills"],
+        "home": ["Philadelphia Eagles", "Miami Dolphins"],
+        "spread_away": [-spread_home, -3.0],
+        "spread_home": [spread_home, 3.0],
+        "total": [total, 44.0],
+        "spreads_book": ["DraftKings", "FanDuel"],
+    })
+
+def records(history):
+    with open(history.path) as f:
+        return [json.loads(line) for line in f]
+
+def test_frame_state_and_diff():
+    before, after = frame_state(board()), frame_state(board(spread_home=-6.5))
+    assert before[GAME]["spread_home"] == -7.0
+    assert before[GAME]["spreads_book"] == "DraftKings"
+    assert diff_state(before, after) == {GAME: {"spread_away": 6.5, "spread_home": -6.5}}
+    assert diff_state(after, after) == {}
+
+def test_append_writes_keyframe_then_deltas(tmp_path):
+    history = LineHistory(1, tmp_path)
+    assert history.append(board(), "2025-09-01T12:00Z") == 2
+    assert history.append(board(), "2025-09-01T13:00Z") == 0
+    assert history.append(board(spread_home=-6.5), "2025-09-01T14:00Z") == 1
+
+    written = records(history)
+    assert [r["full"] for r in written] == [True, False]
+    assert written[1]["games"] == {GAME: {"spread_away": 6.5, "spread_home": -6.5}}
+
+def test_append_rejects_older_snapshots(tmp_path):
+    history = LineHistory(1, tmp_path)
+    history.append(board(), "2025-09-01T12:00Z")
+    with pytest.raises(ValueError):
+        history.append(board(), "2025-09-01T11:00Z")
+
+def test_keyframe_every(tmp_path, monkeypatch):
+    monkeypatch.setattr(line_history, "KEYFRAME_EVERY", 2)
+    history = LineHistory(1, tmp_path)
+    for i, spread in enumerate([-7.0, -6.5, -6.0, -5.5]):
+        history.append(board(spread_home=spread), f"2025-09-01T1{i}:00Z")
+    assert [r["full"] for r in records(history)] == [True, False, True, False]
+    # A reload replays from the nearest keyframe to the same state
+    reloaded = LineHistory(1, tmp_path)
+    assert reloaded.keyframes == [0, 2]
+    assert reloaded.latest() == frame_state(board(spread_home=-5.5))
+
+def test_as_of(tmp_path):
+    history = LineHistory(1, tmp_path)
+    history.append(board(), "2025-09-01T12:00Z")
+    history.append(board(spread_home=-6.5, total=48.0), "2025-09-02T12:00Z")
+
+    assert history.as_of("2025-09-01T11:00Z") == {}
+    assert history.as_of("2025-09-01T18:00Z", GAME)["spread_home"] == -7.0
+    assert history.as_of("2025-09-02T12:00Z", GAME)["total"] == 48.0
+
+    frame = history.frame_as_of("2025-09-01T18:00Z")
+    assert list(frame.columns[:3]) == ["kickoff_et", "away", "home"]
+    assert frame.set_index("away").loc["Buffalo Bills", "spread_home"] == 3.0
+
+def test_moves(tmp_path):
+    history = LineHistory(1, tmp_path)
+    history.append(board(), "2025-09-01T12:00Z")
+    history.append(board(spread_home=-6.5), "2025-09-02T12:00Z")
+    history.append(board(spread_home=-6.5, total=48.0), "2025-09-03T12:00Z")
+    moves = history.moves(GAME, fields=["spread_home"])
+    assert [(old, new) for _, _, old, new in moves] == [(None, -7.0), (-7.0, -6.5)]
+
+def test_pick_spreads(tmp_path):
+    history = LineHistory(1, tmp_path)
+    history.append(board(), "2025-09-01T12:00Z")
+    history.append(board(spread_home=-6.5), "2025-09-02T12:00Z")
+    picks = pd.DataFrame({
+        "team": ["Philadelphia Eagles", "Dallas Cowboys", "Miami Dolphins", "Chicago Bears", "Buffalo Bills"],
+        "created_at": ["2025-09-01T18:00Z", "2025-09-02T18:00Z", "2025-09-02T18:00Z",
+                       "2025-09-02T18:00Z", "2025-08-30T00:00Z"],
+    })
+    spreads = history.pick_spreads(picks)
+    assert list(spreads.iloc[:3]) == [-7.0, 6.5, 3.0]
+    # Unknown team, and a pick made before the first recorded fetch
+    assert np.isnan(spreads.iloc[3]) and np.isnan(spreads.iloc[4])
+
+def test_pick_spreads_without_history(tmp_path):
+    picks = pd.DataFrame({"team": ["Dallas Cowboys"], "created_at": ["2025-09-01T18:00Z"]})
+    assert LineHistory(1, tmp_path).pick_spreads(picks).isna().all()
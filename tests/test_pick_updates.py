@@ -0,0 +1,60 @@
+# test_pick_updates.py
+import pandas as pd
+
+import supabase_integration
+from supabase_integration import grade_rows, update_pick_grades
+
+class FakeTable:
+    """Records update(values).in_('id', ids) calls; fails the first `failures` executes."""
+    def __init__(self, client):
+        self.client = client
+
+    def update(self, values):
+        self.values = values
+        return self
+
+    def in_(self, column, ids):
+        self.ids = ids
+        return self
+
+    def execute(self):
+        if self.client.failures:
+            self.client.failures -= 1
+            raise RuntimeError("503 Service Unavailable")
+        self.client.calls.append((self.values, self.ids))
+        return type("Response", (), {"data": [{"id": i} for i in self.ids]})()
+
+class FakeClient:
+    def __init__(self, failures=0):
+        self.failures, self.calls = failures, []
+
+    def table(self, name):
+        return FakeTable(self)
+
+def test_grade_rows_carries_only_grading_columns():
+    picks = pd.DataFrame({"id": ["a", "b"], "user_id": ["cam", "max"], "team": ["X", "Y"],
+                          "correct": [True, None], "spread": [-3.5, float("nan")]})
+    assert grade_rows(picks) == [{"id": "a", "correct": True, "spread": -3.5},
+                                 {"id": "b", "correct": None}]
+
+def test_update_pick_grades_groups_by_value(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(supabase_integration, "get_supabase_client", lambda: client)
+    rows = [{"id": "a", "correct": True}, {"id": "b", "correct": False},
+            {"id": "c", "correct": True}, {"id": "d", "correct": None}]
+    outcomes = update_pick_grades(rows, chunk_size=3)
+    assert [(o["ok"], o["rows"], o["written"]) for o in outcomes] == [(True, 3, 3), (True, 1, 1)]
+    assert client.calls == [({"correct": True}, ["a", "c"]), ({"correct": False}, ["b"]),
+                            ({"correct": None}, ["d"])]
+
+def test_update_pick_grades_backs_off(monkeypatch):
+    client, sleeps = FakeClient(failures=2), []
+    monkeypatch.setattr(supabase_integration, "get_supabase_client", lambda: client)
+    monkeypatch.setattr(supabase_integration.time, "sleep", sleeps.append)
+    outcome, = update_pick_grades([{"id": "a", "correct": True}], backoff=0.5)
+    assert outcome["ok"] and outcome["attempts"] == 3
+    assert sleeps == [0.5, 1.0]
+
+    client.failures = 3
+    outcome, = update_pick_grades([{"id": "a", "correct": True}], backoff=0.5)
+    assert not outcome["ok"] and "503" in outcome["error"]
@@ -0,0 +1,29 @@
+# test_raw_forecasts.py
+import gzip
+import json
+import os
+
+from weather_script import save_raw_forecast, load_raw_forecast, iter_raw_forecasts, latest_raw_path
+
+INFO = {"stadium": "Lambeau Field"}
+
+def test_save_skips_duplicates(tmp_path):
+    assert save_raw_forecast(INFO, "GB", {"list": [1]}, "t1", tmp_path)
+    assert save_raw_forecast(INFO, "GB", {"list": [1]}, "t2", tmp_path) is None
+    assert save_raw_forecast(INFO, "GB", {"list": [2]}, "t3", tmp_path)
+    assert [r["forecast_time"] for r in iter_raw_forecasts("lambeau_field", tmp_path)] == ["t1", "t3"]
+    assert load_raw_forecast("Lambeau Field", tmp_path) == {"list": [2]}
+
+def test_stale_latest_copy_is_ignored(tmp_path):
+    save_raw_forecast(INFO, "GB", {"list": [1]}, "t1", tmp_path)
+    # A pull appends a newer record to the history behind the local .latest.json
+    newer = {"stadium": "Lambeau Field", "teams": "GB", "forecast_time": "t2", "forecast": {"list": [2]}}
+    with gzip.open(os.path.join(tmp_path, "lambeau_field.jsonl.gz"), "at", encoding="utf-8") as f:
+        f.write(json.dumps(newer) + "\n")
+    assert load_raw_forecast("lambeau_field", tmp_path) == {"list": [2]}
+    assert save_raw_forecast(INFO, "GB", {"list": [2]}, "t3", tmp_path) is None
+
+def test_history_without_latest_copy(tmp_path):
+    save_raw_forecast(INFO, "GB", {"list": [1]}, "t1", tmp_path)
+    os.remove(latest_raw_path("lambeau_field", tmp_path))
+    assert load_raw_forecast("lambeau_field", tmp_path) == {"list": [1]}
@@ -0,0 +1,18 @@
+# test_score_poller.py
+import pandas as pd
+
+from score_poller import sleep_seconds
+
+LINES = pd.DataFrame({"kickoff_et": ["2025-09-07T13:00:00-04:00", "2025-09-07T16:25:00-04:00"]})
+
+def at(clock):
+    return pd.Timestamp(f"2025-09-07T{clock}-04:00").tz_convert("UTC")
+
+def test_sleep_seconds():
+    # During a game window poll at the active interval
+    assert sleep_seconds(LINES, at("14:00:00"), 300, 1800) == 300
+    # Idle, but never past the next kickoff
+    assert sleep_seconds(LINES, at("12:55:00"), 300, 1800) == 301
+    assert sleep_seconds(LINES, at("09:00:00"), 300, 1800) == 1800
+    # After the last kickoff's window there is nothing to wake for
+    assert sleep_seconds(LINES, at("23:30:00"), 300, 1800) == 1800